@@ -3,12 +3,43 @@ Automated Option Chain Monitor
 Monitors MySQL or SQL Server for new snapshots and extracts data when changes are detected.
 """
 
+import atexit
+import os
+import queue
 import time
 import logging
-from datetime import datetime, time as dt_time
+import threading
+
+import pandas as pd
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timedelta, time as dt_time
 from typing import Optional, List, Dict
 from pathlib import Path
 
+# Connection settings come from config.py; guarded so the module still
+# imports standalone (e.g. for offline inspection of the query templates)
+try:
+    from config import get_connection_string
+    HAS_CONFIG = True
+except Exception:
+    HAS_CONFIG = False
+
+# Signal/trading stack; guarded so the monitor can still run for pure data
+# collection when the trading modules (and their dependencies) are absent.
+# Hoisted here because the run loop used to re-import these every tick.
+try:
+    from portfolio_manager import PortfolioManager
+    from generate_signal import (
+        latest_output_file, load_csv, load_prepared, prepare_data,
+        evaluate_signal, get_current_ltp, aggregate_to_3min_snapshots,
+        DEFAULT_STOP_LOSS_PCT, DEFAULT_COOLDOWN_MINUTES,
+    )
+    _HAS_SIGNAL_STACK = True
+except ImportError:
+    _HAS_SIGNAL_STACK = False
+
 # Import timezone handling
 try:
     import pytz
@@ -29,32 +60,83 @@ try:
 except ImportError:
     HAS_PYMYSQL = False
 
-# Configure logging
+# Connection pooling (optional, falls back to plain connections if missing)
+try:
+    from dbutils.pooled_db import PooledDB
+    HAS_DBUTILS = True
+except ImportError:
+    HAS_DBUTILS = False
+
+# Columnar output (optional); CSV remains the primary format the signal
+# pipeline reads, Parquet is an additional compressed copy for analysis.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# pyodbc has built-in connection pooling keyed by connection string;
+# it must be enabled before the first connect() call.
+if HAS_PYODBC:
+    pyodbc.pooling = True
+
+# Configure logging. Records go through a queue so the monitor loop never
+# blocks on file/console I/O; a background listener thread does the writing.
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+# Merge only the message before queueing; the listener's handlers apply the
+# timestamped format (QueueHandler.prepare would otherwise pre-format the
+# record with its own formatter).
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('oi_monitor.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[_queue_handler]
 )
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_file_handler = logging.FileHandler('oi_monitor.log')
+_log_file_handler.setFormatter(_log_formatter)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(_log_formatter)
+_log_listener = QueueListener(
+    _log_queue,
+    _log_file_handler,
+    _log_stream_handler,
+    respect_handler_level=True
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# Connection pools shared across all monitor instances in this process,
+# keyed by the connection coordinates so two monitors against the same
+# server reuse one pool instead of each holding idle connections.
+_POOL_CACHE: Dict[tuple, object] = {}
+
+# How long a fetched latest-snapshot id stays valid before re-querying (seconds).
+# Snapshots arrive minutes apart, so a short TTL removes duplicate probes within
+# one iteration without delaying change detection meaningfully.
+LATEST_ID_CACHE_TTL = 30
+
 # Trading hours configuration
 TRADING_START_TIME = dt_time(9, 15)   # 9:15 AM IST
 TRADING_END_TIME = dt_time(15, 29)     # 3:29 PM IST (last minute of trading)
 TRADING_STOP_TIME = dt_time(15, 30)    # 3:30 PM IST (stop monitoring after this)
 IST_TIMEZONE = 'Asia/Kolkata'
 
+# Built once at import; pytz.timezone() parses the tz database entry on every
+# call and the trading-hour checks ask for IST several times per loop tick.
+# Fallback: fixed UTC offset (not ideal, but works).
+if HAS_PYTZ:
+    _IST_TZ = pytz.timezone(IST_TIMEZONE)
+else:
+    from datetime import timedelta, timezone
+    _IST_TZ = timezone(timedelta(hours=5, minutes=30))
+
 
 def get_ist_timezone():
     """Get IST timezone object."""
-    if HAS_PYTZ:
-        return pytz.timezone(IST_TIMEZONE)
-    else:
-        # Fallback: Use UTC offset (not ideal, but works)
-        from datetime import timedelta, timezone
-        return timezone(timedelta(hours=5, minutes=30))
+    return _IST_TZ
 
 
 def check_pytz_installed():
@@ -65,157 +147,88 @@ def check_pytz_installed():
 
 def get_ist_now():
     """Get current time in IST."""
-    if HAS_PYTZ:
-        return datetime.now(pytz.timezone(IST_TIMEZONE))
-    else:
-        from datetime import timedelta, timezone
-        ist = timezone(timedelta(hours=5, minutes=30))
-        return datetime.now(ist)
+    return datetime.now(_IST_TZ)
+
+
+# The run loop asks for trading-hour state several times per tick; each check
+# used to build tz-aware datetimes. The per-day cache reduces them to float
+# compares against time.time(): (valid_until, weekday, start, end, stop)
+# epochs, rebuilt lazily after IST midnight.
+_day_cache = None
+
+
+def _day_bounds():
+    """Return today's (valid_until, weekday, start, end, stop) epoch tuple."""
+    global _day_cache
+    if _day_cache is None or time.time() >= _day_cache[0]:
+        ist_now = get_ist_now()
+        midnight = ist_now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        def _epoch(t: dt_time) -> float:
+            return (midnight + timedelta(hours=t.hour, minutes=t.minute)).timestamp()
+
+        _day_cache = (
+            (midnight + timedelta(days=1)).timestamp(),
+            ist_now.weekday(),  # 0=Monday, 6=Sunday
+            _epoch(TRADING_START_TIME),
+            _epoch(TRADING_END_TIME),
+            _epoch(TRADING_STOP_TIME),
+        )
+    return _day_cache
 
 
 def is_trading_day():
     """Check if today is a trading day (Monday-Friday)."""
-    ist_now = get_ist_now()
-    weekday = ist_now.weekday()  # 0=Monday, 6=Sunday
-    return weekday < 5  # Monday to Friday (0-4)
+    return _day_bounds()[1] < 5  # Monday to Friday (0-4)
 
 
 def is_trading_time():
     """Check if current time is within trading hours (9:15 AM - 3:29 PM IST, Mon-Fri)."""
-    if not is_trading_day():
+    _, weekday, start, end, _ = _day_bounds()
+    if weekday >= 5:
         return False
-    
-    ist_now = get_ist_now()
-    current_time = ist_now.time()
     # Trading hours: 9:15 AM to 3:29 PM (inclusive of 3:29:00)
     # Include 3:29:00 PM but exclude anything after
-    return TRADING_START_TIME <= current_time <= TRADING_END_TIME
+    return start <= time.time() <= end
 
 
 def should_stop_trading():
     """Check if we should stop trading (after 3:29 PM IST, i.e., at or after 3:30 PM)."""
-    if not is_trading_day():
+    _, weekday, _, _, stop = _day_bounds()
+    if weekday >= 5:
         return True  # Stop on weekends
-    
-    ist_now = get_ist_now()
-    current_time = ist_now.time()
     # Stop if current time is at or after 3:30 PM
     # This allows trading until 3:29:59 PM, then stops at 3:30:00 PM
-    return current_time >= TRADING_STOP_TIME
+    return time.time() >= stop
 
 
-class OptionChainMonitor:
-    """Monitors option chain snapshots and extracts data when new snapshots are available."""
-    
-    def __init__(self, connection_config: Dict, ticker: str = 'NIFTY'):
-        """
-        Initialize the monitor.
-        
-        Args:
-            connection_config: Database connection configuration dictionary
-            ticker: Ticker symbol to monitor (default: 'NIFTY')
-        """
-        self.config = connection_config
-        self.db_type = connection_config['type']
-        self.ticker = ticker
-        self.last_snapshot_id: Optional[int] = None
-        
-        # SQL Server query (uses TOP and ? parameters)
-        # Fetches last 12 snapshots in a single query (to build 3-minute aggregates)
-        self.query_template_sqlserver = """
-WITH Last3Snapshots AS (
-    SELECT DISTINCT TOP 12 SNAPSHOT_ID
-    FROM optionchain_combined
-    WHERE TICKER = ?
-    ORDER BY SNAPSHOT_ID DESC
+# Main extraction query, shared by both dialects. {p} is the parameter token
+# (%s for pymysql, ? for pyodbc), {datediff} the dialect's day-difference
+# expression; both are rendered once per instance in __init__. The
+# {snapshot_source} slot is left in place for per-call rendering.
+_QUERY_BASE = """
+WITH SnapshotSet AS (
+    {snapshot_source}
 ),
-ClosestExpiry AS (
-    SELECT
-        oc.DOWNLOAD_DATE,
-        oc.DOWNLOAD_TIME,
-        oc.SNAPSHOT_ID,
-        oc.EXPIRY,
-        oc.STRIKE,
-        oc.UNDERLYING_VALUE,
-        oc.c_OI,
-        oc.c_CHNG_IN_OI,
-        oc.c_LTP,
-        oc.c_VOLUME,
-        oc.p_OI,
-        oc.p_CHNG_IN_OI,
-        oc.p_LTP,
-        oc.p_VOLUME,
+ExpiryRank AS (
+    -- Rank expiries over the distinct (snapshot, expiry) pairs only; ranking
+    -- every option row forces a sort of the whole join. The join back below
+    -- is plain column equality, so it stays indexable on
+    -- (TICKER, SNAPSHOT_ID, EXPIRY).
+    SELECT SNAPSHOT_ID, EXPIRY,
         DENSE_RANK() OVER (
-            PARTITION BY oc.SNAPSHOT_ID
-            ORDER BY ABS(DATEDIFF(day, oc.EXPIRY, oc.DOWNLOAD_DATE))
+            PARTITION BY SNAPSHOT_ID
+            ORDER BY ABS({datediff})
         ) AS expiry_rank
-    FROM optionchain_combined oc
-    JOIN Last3Snapshots l3
-        ON oc.SNAPSHOT_ID = l3.SNAPSHOT_ID
-    WHERE oc.TICKER = ?
+    FROM (
+        SELECT DISTINCT oc.SNAPSHOT_ID, oc.EXPIRY, oc.DOWNLOAD_DATE
+        FROM optionchain_combined oc
+        JOIN SnapshotSet ss
+            ON oc.SNAPSHOT_ID = ss.SNAPSHOT_ID
+        WHERE oc.TICKER = {p}
+    ) e
 ),
 FilteredExpiry AS (
-    SELECT *
-    FROM ClosestExpiry
-    WHERE expiry_rank = 1
-),
-StrikesAboveBelow AS (
-    SELECT *,
-        CASE
-            WHEN STRIKE >= UNDERLYING_VALUE THEN
-                ROW_NUMBER() OVER (
-                    PARTITION BY SNAPSHOT_ID
-                    ORDER BY
-                        CASE WHEN STRIKE >= UNDERLYING_VALUE THEN 0 ELSE 1 END,
-                        STRIKE ASC
-                )
-            ELSE NULL
-        END AS above_rank,
-        CASE
-            WHEN STRIKE < UNDERLYING_VALUE THEN
-                ROW_NUMBER() OVER (
-                    PARTITION BY SNAPSHOT_ID
-                    ORDER BY
-                        CASE WHEN STRIKE < UNDERLYING_VALUE THEN 0 ELSE 1 END,
-                        STRIKE DESC
-                )
-            ELSE NULL
-        END AS below_rank
-    FROM FilteredExpiry
-)
-SELECT
-    DOWNLOAD_DATE,
-    DOWNLOAD_TIME,
-    SNAPSHOT_ID,
-    EXPIRY,
-    STRIKE,
-    UNDERLYING_VALUE,
-    c_OI,
-    c_CHNG_IN_OI,
-    c_LTP,
-    c_VOLUME,
-    p_OI,
-    p_CHNG_IN_OI,
-    p_LTP,
-    p_VOLUME,
-    above_rank,
-    below_rank
-FROM StrikesAboveBelow
-WHERE above_rank < 10 OR below_rank < 10
-ORDER BY SNAPSHOT_ID, STRIKE
-"""
-        
-        # MySQL query (uses LIMIT and %s parameters, DATEDIFF syntax)
-        # Fetches last 12 snapshots in a single query (to build 3-minute aggregates)
-        self.query_template_mysql = """
-WITH Last3Snapshots AS (
-    SELECT DISTINCT SNAPSHOT_ID
-    FROM optionchain_combined
-    WHERE TICKER = %s
-    ORDER BY SNAPSHOT_ID DESC
-    LIMIT 12
-),
-ClosestExpiry AS (
     SELECT
         oc.DOWNLOAD_DATE,
         oc.DOWNLOAD_TIME,
@@ -230,44 +243,35 @@ ClosestExpiry AS (
         oc.p_OI,
         oc.p_CHNG_IN_OI,
         oc.p_LTP,
-        oc.p_VOLUME,
-        DENSE_RANK() OVER (
-            PARTITION BY oc.SNAPSHOT_ID
-            ORDER BY ABS(DATEDIFF(oc.EXPIRY, oc.DOWNLOAD_DATE))
-        ) AS expiry_rank
+        oc.p_VOLUME
     FROM optionchain_combined oc
-    JOIN Last3Snapshots l3
-        ON oc.SNAPSHOT_ID = l3.SNAPSHOT_ID
-    WHERE oc.TICKER = %s
-),
-FilteredExpiry AS (
-    SELECT *
-    FROM ClosestExpiry
-    WHERE expiry_rank = 1
+    JOIN ExpiryRank er
+        ON oc.SNAPSHOT_ID = er.SNAPSHOT_ID
+        AND oc.EXPIRY = er.EXPIRY
+    WHERE oc.TICKER = {p} AND er.expiry_rank = 1
 ),
 StrikesAboveBelow AS (
+    -- Each side is filtered before its window runs, so the ranking sorts
+    -- only the rows that can survive the rank cutoff below instead of the
+    -- full chain. The plain-column predicates and ORDER BY STRIKE keep both
+    -- branches index-friendly.
     SELECT *,
-        CASE
-            WHEN STRIKE >= UNDERLYING_VALUE THEN
-                ROW_NUMBER() OVER (
-                    PARTITION BY SNAPSHOT_ID
-                    ORDER BY
-                        CASE WHEN STRIKE >= UNDERLYING_VALUE THEN 0 ELSE 1 END,
-                        STRIKE ASC
-                )
-            ELSE NULL
-        END AS above_rank,
-        CASE
-            WHEN STRIKE < UNDERLYING_VALUE THEN
-                ROW_NUMBER() OVER (
-                    PARTITION BY SNAPSHOT_ID
-                    ORDER BY
-                        CASE WHEN STRIKE < UNDERLYING_VALUE THEN 0 ELSE 1 END,
-                        STRIKE DESC
-                )
-            ELSE NULL
-        END AS below_rank
+        ROW_NUMBER() OVER (
+            PARTITION BY SNAPSHOT_ID
+            ORDER BY STRIKE ASC
+        ) AS above_rank,
+        NULL AS below_rank
+    FROM FilteredExpiry
+    WHERE STRIKE >= UNDERLYING_VALUE
+    UNION ALL
+    SELECT *,
+        NULL AS above_rank,
+        ROW_NUMBER() OVER (
+            PARTITION BY SNAPSHOT_ID
+            ORDER BY STRIKE DESC
+        ) AS below_rank
     FROM FilteredExpiry
+    WHERE STRIKE < UNDERLYING_VALUE
 )
 SELECT
     DOWNLOAD_DATE,
@@ -290,94 +294,501 @@ FROM StrikesAboveBelow
 WHERE above_rank < 10 OR below_rank < 10
 ORDER BY SNAPSHOT_ID, STRIKE
 """
+
+# Both dialect renderings are produced once at import: instances share the
+# interned strings instead of holding per-instance copies, and a stable
+# string identity helps driver-side statement caches key consistently.
+_QUERY_SQLSERVER = _QUERY_BASE.format(
+    p='?',
+    datediff='DATEDIFF(day, EXPIRY, DOWNLOAD_DATE)',
+    snapshot_source='{snapshot_source}'
+)
+_QUERY_MYSQL = _QUERY_BASE.format(
+    p='%s',
+    datediff='DATEDIFF(EXPIRY, DOWNLOAD_DATE)',
+    snapshot_source='{snapshot_source}'
+)
+
+
+class OptionChainMonitor:
+    """Monitors option chain snapshots and extracts data when new snapshots are available."""
     
+    def __init__(self, connection_config: Dict, ticker: str = 'NIFTY'):
+        """
+        Initialize the monitor.
+        
+        Args:
+            connection_config: Database connection configuration dictionary
+            ticker: Ticker symbol to monitor (default: 'NIFTY')
+        """
+        self.config = connection_config
+        self.db_type = connection_config['type']
+        self.ticker = ticker
+        self.last_snapshot_id: Optional[int] = None
+        self._pool = None  # Lazily created connection pool (MySQL only)
+        # Long-lived connection/cursor for the repeated main query; pyodbc
+        # reuses the prepared statement when the same SQL re-runs on one cursor.
+        self._stmt_conn = None
+        self._stmt_cursor = None
+        # Event-driven change detection (optional, see sql/snapshot_events.sql)
+        self._has_event_table: Optional[bool] = None
+        self._last_event_id = 0
+        # Pre-ranked lookup table (optional, see sql/mv_optionchain_ranked.sql)
+        self._has_ranked_table: Optional[bool] = None
+        # (fetch_time, snapshot_id) TTL cache for get_latest_snapshot_id
+        self._latest_id_cache: Optional[tuple] = None
+        # Opt-in DB-side entry-signal pre-filter (see scan_signals_in_db)
+        self._db_signal_scan = os.getenv('DB_SIGNAL_SCAN', '0') == '1'
+        # Rolling window of observed snapshot ids, most recent first; when the
+        # last three are contiguous, collection can reuse them without waiting
+        self._recent_snapshots: deque = deque(maxlen=3)
+        # Monotonic timestamps of recent successful collections; their mean
+        # spacing estimates the feed cadence for the run-loop poll interval
+        self._arrival_times: deque = deque(maxlen=8)
+        # Set to interrupt waits and stop the monitor loop gracefully
+        self._stop = threading.Event()
+        # Shared PortfolioManager; constructing one re-reads portfolio.json,
+        # so the monitor keeps a single instance for all trade/status paths
+        self._portfolio_manager = None
+        
+        # The two dialects share one query body; only the parameter token and
+        # DATEDIFF argument form differ, rendered here once. The
+        # {snapshot_source} slot survives rendering and selects which
+        # SNAPSHOT_IDs to fetch: the default form pulls the last 12 (to build
+        # 3-minute aggregates), and callers can bind an explicit id list
+        # instead (see execute_query_for_snapshots).
+        # Dialect templates are module constants (_QUERY_MYSQL /
+        # _QUERY_SQLSERVER); these aliases keep the old attribute names
+        self.query_template_sqlserver = _QUERY_SQLSERVER
+        self.query_template_mysql = _QUERY_MYSQL
+
+        # Bind the active dialect's template (and its rendered default form)
+        # once, instead of re-branching on db_type per query
+        self._query_template_raw = (
+            _QUERY_MYSQL if self.db_type == 'mysql' else _QUERY_SQLSERVER
+        )
+        self._query_template = self._query_template_raw.format(
+            snapshot_source=self._snapshot_source())
+    
+    def _snapshot_source(self, snapshot_ids: Optional[List[int]] = None) -> str:
+        """
+        Build the SnapshotSet subquery for the main CTE.
+
+        With snapshot_ids, binds them as an IN (...) list so one query fetches
+        exactly those snapshots; without, falls back to the last-12 form.
+        """
+        placeholder = '%s' if self.db_type == 'mysql' else '?'
+        if snapshot_ids:
+            id_list = ','.join([placeholder] * len(snapshot_ids))
+            return (
+                f"SELECT DISTINCT SNAPSHOT_ID FROM optionchain_combined "
+                f"WHERE TICKER = {placeholder} AND SNAPSHOT_ID IN ({id_list})"
+            )
+        if self.db_type == 'mysql':
+            return (
+                "SELECT DISTINCT SNAPSHOT_ID FROM optionchain_combined "
+                "WHERE TICKER = %s ORDER BY SNAPSHOT_ID DESC LIMIT 12"
+            )
+        return (
+            "SELECT DISTINCT TOP 12 SNAPSHOT_ID FROM optionchain_combined "
+            "WHERE TICKER = ? ORDER BY SNAPSHOT_ID DESC"
+        )
+
     @property
     def query_template(self):
-        """Get the appropriate query template based on database type."""
-        if self.db_type == 'mysql':
-            return self.query_template_mysql
-        else:
-            return self.query_template_sqlserver
+        """The active dialect's query template (last-12-snapshots form)."""
+        return self._query_template
     
-    def get_connection(self):
-        """Create and return a database connection."""
-        try:
-            if self.db_type == 'mysql':
-                if not HAS_PYMYSQL:
-                    raise ImportError("pymysql is required for MySQL connections. Install it with: pip install pymysql")
-                conn = pymysql.connect(
+    def _get_pool(self):
+        """Lazily create or reuse the process-wide MySQL connection pool."""
+        if self._pool is None:
+            key = (self.db_type, self.config['host'], self.config['port'],
+                   self.config['user'], self.config['database'])
+            pool = _POOL_CACHE.get(key)
+            if pool is None:
+                pool = PooledDB(
+                    creator=pymysql,
+                    mincached=1,
+                    maxcached=4,
+                    maxconnections=8,
+                    blocking=True,
+                    # Ping idle connections when borrowed so a server-side
+                    # timeout surfaces as a transparent reconnect, not an
+                    # OperationalError mid-query
+                    ping=1,
                     host=self.config['host'],
                     port=self.config['port'],
                     user=self.config['user'],
                     password=self.config['password'],
                     database=self.config['database'],
-                    connect_timeout=self.config['connect_timeout'],
-                    cursorclass=pymysql.cursors.DictCursor
+                    connect_timeout=self.config['connect_timeout']
                 )
+                _POOL_CACHE[key] = pool
+                atexit.register(pool.close)
+                logger.debug("Created MySQL connection pool")
+            self._pool = pool
+        return self._pool
+
+    def get_connection(self):
+        """
+        Return a database connection.
+
+        Connections are borrowed from a pool where possible (DBUtils for MySQL,
+        pyodbc's built-in pooling for SQL Server), so opening/closing one per
+        query no longer pays the TCP + auth handshake each time. Callers keep
+        calling conn.close(); pooled connections are returned, not torn down.
+        """
+        try:
+            if self.db_type == 'mysql':
+                if not HAS_PYMYSQL:
+                    raise ImportError("pymysql is required for MySQL connections. Install it with: pip install pymysql")
+                if HAS_DBUTILS:
+                    conn = self._get_pool().connection()
+                else:
+                    conn = pymysql.connect(
+                        host=self.config['host'],
+                        port=self.config['port'],
+                        user=self.config['user'],
+                        password=self.config['password'],
+                        database=self.config['database'],
+                        connect_timeout=self.config['connect_timeout']
+                    )
             else:  # SQL Server
                 if not HAS_PYODBC:
                     raise ImportError("pyodbc is required for SQL Server connections. Install it with: pip install pyodbc")
-                from config import get_connection_string
+                if not HAS_CONFIG:
+                    raise ImportError("config.py is required for SQL Server connections")
                 conn = pyodbc.connect(get_connection_string())
             return conn
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
     
-    def get_latest_snapshot_id(self) -> Optional[int]:
+    def _dict_cursor(self, conn):
+        """
+        Dict-row cursor for the wide extraction queries. Plain tuple cursors
+        are the default everywhere else; the id probes only read column 0 and
+        don't need a dict allocated per row.
+        """
+        if self.db_type == 'mysql':
+            return conn.cursor(pymysql.cursors.DictCursor)
+        return conn.cursor()
+
+    @contextmanager
+    def _session(self, cursor=None, dict_rows=False):
+        """
+        Yield a cursor for one unit of work.
+
+        Pass an existing cursor to chain several helper calls over a single
+        connection (one handshake per iteration instead of one per call);
+        without one, a pooled connection is borrowed and returned on exit.
+        dict_rows selects a dict-row cursor when a fresh one is opened.
+        """
+        if cursor is not None:
+            yield cursor
+            return
+        conn = self.get_connection()
+        try:
+            yield self._dict_cursor(conn) if dict_rows else conn.cursor()
+        finally:
+            conn.close()
+
+    def _get_statement_cursor(self):
+        """
+        Return a cursor on a long-lived connection reserved for the main query.
+
+        Re-executing the same SQL on one cursor lets the driver (pyodbc) and
+        server reuse the prepared statement plan instead of re-parsing the
+        multi-CTE query on every call.
+        """
+        if self._stmt_cursor is None:
+            self._stmt_conn = self.get_connection()
+            self._stmt_cursor = self._dict_cursor(self._stmt_conn)
+        return self._stmt_cursor
+
+    def _drop_statement_cursor(self):
+        """Discard the statement connection (e.g. after a server-side timeout)."""
+        try:
+            if self._stmt_conn is not None:
+                self._stmt_conn.close()
+        except Exception:
+            pass
+        self._stmt_conn = None
+        self._stmt_cursor = None
+
+    def _execute_statement(self, query: str, params: tuple):
+        """Execute on the statement cursor, reconnecting once if it went stale."""
+        cursor = self._get_statement_cursor()
+        try:
+            cursor.execute(query, params)
+        except Exception:
+            self._drop_statement_cursor()
+            cursor = self._get_statement_cursor()
+            cursor.execute(query, params)
+        return cursor
+
+    def _ranked_table_available(self) -> bool:
+        """
+        Check once whether the optional mv_optionchain_ranked table exists.
+        Installed by sql/mv_optionchain_ranked.sql; when present, reads become
+        indexed lookups instead of re-running the window-function CTE.
+        """
+        if self._has_ranked_table is None:
+            if self.db_type != 'mysql':
+                self._has_ranked_table = False
+            else:
+                try:
+                    cursor = self._execute_statement(
+                        "SELECT 1 FROM mv_optionchain_ranked LIMIT 1", ())
+                    cursor.fetchall()
+                    self._has_ranked_table = True
+                    logger.info("mv_optionchain_ranked table found - using pre-ranked lookups")
+                except Exception:
+                    self._has_ranked_table = False
+                    logger.debug("mv_optionchain_ranked not available - ranking inline")
+        return self._has_ranked_table
+
+    def _fetch_ranked(self, snapshot_ids: List[int]) -> Optional[pd.DataFrame]:
+        """
+        Fetch the given snapshots from the pre-ranked table.
+
+        Returns None when the table is missing or does not yet contain every
+        requested snapshot (refresh lag), so the caller falls back to the
+        inline CTE.
+        """
+        if not snapshot_ids or not self._ranked_table_available():
+            return None
+        try:
+            id_list = ','.join(['%s'] * len(snapshot_ids))
+            query = f"""
+            SELECT
+                DOWNLOAD_DATE, DOWNLOAD_TIME, SNAPSHOT_ID, EXPIRY, STRIKE,
+                UNDERLYING_VALUE, c_OI, c_CHNG_IN_OI, c_LTP, c_VOLUME,
+                p_OI, p_CHNG_IN_OI, p_LTP, p_VOLUME, above_rank, below_rank
+            FROM mv_optionchain_ranked
+            WHERE TICKER = %s AND SNAPSHOT_ID IN ({id_list})
+              AND (above_rank < 10 OR below_rank < 10)
+            ORDER BY SNAPSHOT_ID, STRIKE
+            """
+            cursor = self._execute_statement(query, (self.ticker, *snapshot_ids))
+            df = self._fetch_dataframe(cursor)
+            if df.empty or set(df['SNAPSHOT_ID']) != set(snapshot_ids):
+                logger.debug("Ranked table missing some snapshots - falling back to inline CTE")
+                return None
+            return df
+        except Exception as e:
+            logger.debug("Ranked table fetch failed, falling back: %s", e)
+            return None
+
+    def _fetch_dataframe(self, cursor, batch_size: int = 1000) -> pd.DataFrame:
+        """
+        Materialise a result set as a DataFrame; one pathway for both backends.
+
+        pandas.read_sql_query warns on raw DBAPI connections and still walks
+        rows in Python, so this builds from cursor.description directly:
+        column names are resolved once and rows drain in fetchmany batches,
+        keeping peak memory bounded and skipping the per-row dict step.
+        from_records handles tuple rows (pyodbc/pymysql) and dict rows
+        (the long-lived statement cursor) alike.
+        """
+        columns = [column[0] for column in cursor.description]
+        cursor.arraysize = batch_size
+        rows = []
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            rows.extend(batch)
+        if not rows:
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    def _event_table_available(self) -> bool:
+        """
+        Check once whether the optional snapshot_events table exists.
+        The table and its trigger are installed by sql/snapshot_events.sql;
+        when present, the monitor waits on events instead of polling.
+        """
+        if self._has_event_table is None:
+            if self.db_type != 'mysql':
+                self._has_event_table = False
+            else:
+                try:
+                    conn = self.get_connection()
+                    cursor = conn.cursor()
+                    cursor.execute(
+                        "SELECT MAX(id) AS id FROM snapshot_events WHERE ticker = %s",
+                        (self.ticker,)
+                    )
+                    row = cursor.fetchone()
+                    conn.close()
+                    if row and row[0] is not None:
+                        self._last_event_id = row[0]
+                    self._has_event_table = True
+                    logger.info("snapshot_events table found - using event-driven change detection")
+                except Exception:
+                    self._has_event_table = False
+                    logger.debug("snapshot_events table not available - falling back to polling")
+        return self._has_event_table
+
+    def wait_for_new_snapshot(self, timeout: int) -> Optional[int]:
+        """
+        Wait up to timeout seconds for a new snapshot to be announced.
+
+        Uses the snapshot_events table when installed (indexed probe plus a
+        server-side SLEEP between probes, so no repeated scans of the large
+        snapshot table); otherwise falls back to a plain client-side sleep.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            New snapshot ID if an event arrived, None on timeout/fallback
+        """
+        if not self._event_table_available():
+            self._stop.wait(timeout)
+            return None
+
+        deadline = time.time() + timeout
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            while not self._stop.is_set():
+                cursor.execute(
+                    """
+                    SELECT id, snapshot_id FROM snapshot_events
+                    WHERE ticker = %s AND id > %s
+                    ORDER BY id LIMIT 1
+                    """,
+                    (self.ticker, self._last_event_id)
+                )
+                row = cursor.fetchone()
+                if row:
+                    self._last_event_id = row[0]
+                    conn.close()
+                    return row[1]
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                # Wait on the server between probes to keep the client quiet
+                cursor.execute("SELECT SLEEP(%s)", (min(remaining, 5),))
+                cursor.fetchall()
+            conn.close()
+            return None
+        except Exception as e:
+            logger.debug("Event wait failed, falling back to sleep: %s", e)
+            self._stop.wait(max(0, deadline - time.time()))
+            return None
+
+    def _new_snapshot_available(self) -> bool:
+        """
+        Cheap probe for the run() loop: is there anything newer than the last
+        processed snapshot? Uses the bounded MAX() query (and its TTL cache),
+        so idle ticks cost one index seek instead of a full collection cycle.
+        """
+        latest = self.get_latest_snapshot_id()
+        if latest is None:
+            return False
+        return self.last_snapshot_id is None or latest > self.last_snapshot_id
+
+    def stop(self):
+        """Request a graceful shutdown: wakes any pending wait in run()."""
+        self._stop.set()
+
+    def _note_snapshot(self, snapshot_id: Optional[int]):
+        """Record an observed snapshot id in the rolling recent-ids window."""
+        if snapshot_id is None:
+            return
+        if not self._recent_snapshots or snapshot_id != self._recent_snapshots[0]:
+            self._recent_snapshots.appendleft(snapshot_id)
+
+    def _estimated_cadence(self) -> Optional[float]:
+        """Mean spacing (seconds) of recent collections, None until two exist."""
+        if len(self._arrival_times) < 2:
+            return None
+        times = list(self._arrival_times)
+        return (times[-1] - times[0]) / (len(times) - 1)
+
+    def invalidate_latest_snapshot_cache(self):
+        """Drop the cached latest snapshot id (call when new data is known to exist)."""
+        self._latest_id_cache = None
+
+    def _record_event_snapshot(self, snapshot_id: int):
+        """
+        Absorb a snapshot id pushed by the event table.
+
+        The event payload already names the latest snapshot, so prime the
+        TTL cache with it instead of invalidating — the follow-up
+        get_latest_snapshot_id then skips its MAX(SNAPSHOT_ID) probe.
+        """
+        self._latest_id_cache = (time.time(), snapshot_id)
+        self._note_snapshot(snapshot_id)
+
+    def get_latest_snapshot_id(self, cursor=None) -> Optional[int]:
         """
         Get the latest snapshot ID for the ticker from optionchain_combined.
-        
+        Results are cached for LATEST_ID_CACHE_TTL seconds so repeated calls
+        within one iteration don't each hit the database.
+
+        Args:
+            cursor: Optional cursor from an enclosing _session
+
         Returns:
             Latest snapshot ID or None if no snapshots found
         """
-        if self.db_type == 'mysql':
-            query = """
-            SELECT SNAPSHOT_ID
+        if self._latest_id_cache is not None:
+            fetched_at, cached_id = self._latest_id_cache
+            if time.time() - fetched_at < LATEST_ID_CACHE_TTL:
+                logger.debug("Latest snapshot ID (cached): %s", cached_id)
+                return cached_id
+
+        placeholder = '%s' if self.db_type == 'mysql' else '?'
+        if self.last_snapshot_id is not None:
+            # Bounded probe: with the known last id as a lower bound, the
+            # server answers from an index range seek; MAX comes back NULL
+            # when nothing newer exists.
+            query = f"""
+            SELECT MAX(SNAPSHOT_ID)
             FROM optionchain_combined
-            WHERE TICKER = %s
-            ORDER BY SNAPSHOT_ID DESC
-            LIMIT 1
+            WHERE TICKER = {placeholder} AND SNAPSHOT_ID > {placeholder}
             """
-            params = (self.ticker,)
-        else:  # SQL Server
-            query = """
-            SELECT TOP 1 SNAPSHOT_ID
+            params = (self.ticker, self.last_snapshot_id)
+        else:
+            query = f"""
+            SELECT MAX(SNAPSHOT_ID)
             FROM optionchain_combined
-            WHERE TICKER = ?
-            ORDER BY SNAPSHOT_ID DESC
+            WHERE TICKER = {placeholder}
             """
             params = (self.ticker,)
-        
+
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            row = cursor.fetchone()
-            conn.close()
-            
-            if row:
-                # Handle different cursor types
-                if self.db_type == 'mysql':
-                    snapshot_id = row['SNAPSHOT_ID']
+            with self._session(cursor) as cur:
+                cur.execute(query, params)
+                row = cur.fetchone()
+
+            snapshot_id = row[0] if row else None
+            if snapshot_id is None:
+                if self.last_snapshot_id is not None:
+                    # Nothing newer than the bound - latest is still the known id
+                    snapshot_id = self.last_snapshot_id
                 else:
-                    snapshot_id = row[0]
-                logger.debug(f"Latest snapshot ID: {snapshot_id}")
-                return snapshot_id
-            else:
-                logger.warning(f"No snapshots found for ticker {self.ticker}")
-                return None
+                    logger.warning(f"No snapshots found for ticker {self.ticker}")
+                    return None
+            self._latest_id_cache = (time.time(), snapshot_id)
+            logger.debug("Latest snapshot ID: %s", snapshot_id)
+            return snapshot_id
         except Exception as e:
             logger.error(f"Error getting latest snapshot ID: {e}")
             return None
     
-    def get_snapshot_ids(self, limit: int = 3) -> List[int]:
+    def get_snapshot_ids(self, limit: int = 3, cursor=None) -> List[int]:
         """
         Get the last N snapshot IDs for the ticker from optionchain_combined.
-        
+
         Args:
             limit: Number of snapshot IDs to retrieve
-            
+            cursor: Optional cursor from an enclosing _session
+
         Returns:
             List of snapshot IDs (most recent first)
         """
@@ -391,35 +802,31 @@ ORDER BY SNAPSHOT_ID, STRIKE
             """
             params = (self.ticker, limit)
         else:  # SQL Server
-            query = f"""
-            SELECT DISTINCT TOP {limit} SNAPSHOT_ID
+            # TOP (?) binds the limit so every call shares one cached plan
+            query = """
+            SELECT DISTINCT TOP (?) SNAPSHOT_ID
             FROM optionchain_combined
             WHERE TICKER = ?
             ORDER BY SNAPSHOT_ID DESC
             """
-            params = (self.ticker,)
+            params = (limit, self.ticker)
         
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            conn.close()
-            
-            if self.db_type == 'mysql':
-                snapshot_ids = [row['SNAPSHOT_ID'] for row in rows]
-            else:
-                snapshot_ids = [row[0] for row in rows]
-            logger.debug(f"Retrieved {len(snapshot_ids)} snapshot IDs: {snapshot_ids}")
+            with self._session(cursor) as cur:
+                cur.execute(query, params)
+                rows = cur.fetchall()
+
+            snapshot_ids = [row[0] for row in rows]
+            logger.debug("Retrieved %d snapshot IDs: %s", len(snapshot_ids), snapshot_ids)
             return snapshot_ids
         except Exception as e:
             logger.error(f"Error getting snapshot IDs: {e}")
             return []
     
-    def get_strikes_for_snapshot(self, snapshot_id: int) -> tuple:
+    def get_strikes_for_snapshot(self, snapshot_id: int, cursor=None) -> tuple:
         """
         Get the underlying value and list of strikes (ATM±9) for a given snapshot.
-        
+
         Returns:
             Tuple of (underlying_value, list_of_strikes)
         """
@@ -441,22 +848,22 @@ ORDER BY SNAPSHOT_ID, STRIKE
             params = (self.ticker, snapshot_id)
         
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            conn.close()
-            
+            with self._session(cursor) as cur:
+                cur.arraysize = 256
+                cur.execute(query, params)
+                rows = []
+                while True:
+                    batch = cur.fetchmany(256)
+                    if not batch:
+                        break
+                    rows.extend(batch)
+
             if not rows:
                 return None, []
             
             # Get underlying value (should be same for all rows in a snapshot)
-            if self.db_type == 'mysql':
-                underlying = rows[0]['UNDERLYING_VALUE']
-                strikes = sorted(set(row['STRIKE'] for row in rows))
-            else:
-                underlying = rows[0][0]
-                strikes = sorted(set(row[1] for row in rows))
+            underlying = rows[0][0]
+            strikes = sorted(set(row[1] for row in rows))
             
             # Find ATM strike (closest to underlying)
             atm_strike = min(strikes, key=lambda s: abs(s - underlying))
@@ -473,14 +880,18 @@ ORDER BY SNAPSHOT_ID, STRIKE
             logger.error(f"Error getting strikes for snapshot {snapshot_id}: {e}")
             return None, []
     
-    def execute_query_for_fixed_strikes(self, snapshot_ids: List[int], strikes: List[float]) -> List[Dict]:
+    def execute_query_for_fixed_strikes(self, snapshot_ids: List[int], strikes: List[float],
+                                        cursor=None) -> pd.DataFrame:
         """
         Fetch data for specific snapshots and specific strikes.
         This ensures we track the same strikes across all snapshots.
+
+        Args:
+            cursor: Optional cursor from an enclosing _session
         """
         if not snapshot_ids or not strikes:
-            return []
-        
+            return pd.DataFrame()
+
         # Build strike list for IN clause
         strikes_str = ','.join(str(s) for s in strikes)
         
@@ -584,113 +995,109 @@ ORDER BY SNAPSHOT_ID, STRIKE
             params = (self.ticker,) + tuple(snapshot_ids) + tuple(strikes)
         
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            results = []
-            if self.db_type == 'mysql':
-                results = list(rows)
-            else:
-                columns = [column[0] for column in cursor.description]
-                for row in rows:
-                    result_dict = dict(zip(columns, row))
-                    results.append(result_dict)
-            conn.close()
+            with self._session(cursor) as cur:
+                cur.execute(query, params)
+                results = self._fetch_dataframe(cur)
             logger.info(f"Retrieved {len(results)} rows for {len(snapshot_ids)} snapshots with {len(strikes)} fixed strikes")
             return results
         except Exception as e:
-            logger.error(f"Error executing query for fixed strikes: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return []
+            logger.error("Error executing query for fixed strikes", exc_info=True)
+            return pd.DataFrame()
     
-    def execute_query_for_snapshot(self, snapshot_id: int) -> List[Dict]:
+    def _render_query(self, snapshot_source: str) -> str:
+        """Render the main query template with the given SnapshotSet subquery."""
+        return self._query_template_raw.format(snapshot_source=snapshot_source)
+
+    def execute_query_for_snapshot(self, snapshot_id: int) -> pd.DataFrame:
         """
         Execute the main query for a specific snapshot ID.
+
+        Returns a DataFrame (column-oriented from the start, so downstream
+        consumers don't rebuild one from a list of per-row dicts).
         """
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            params = (self.ticker, snapshot_id)
-            cursor.execute(self.query_template, params)
-            rows = cursor.fetchall()
-            results = []
-            if self.db_type == 'mysql':
-                results = list(rows)
-            else:
-                columns = [column[0] for column in cursor.description]
-                for row in rows:
-                    result_dict = dict(zip(columns, row))
-                    results.append(result_dict)
-            conn.close()
-            return results
+            ranked = self._fetch_ranked([snapshot_id])
+            if ranked is not None:
+                return ranked
+            placeholder = '%s' if self.db_type == 'mysql' else '?'
+            source = (
+                f"SELECT DISTINCT SNAPSHOT_ID FROM optionchain_combined "
+                f"WHERE TICKER = {placeholder} AND SNAPSHOT_ID = {placeholder}"
+            )
+            params = (self.ticker, snapshot_id, self.ticker, self.ticker)
+            cursor = self._execute_statement(self._render_query(source), params)
+            return self._fetch_dataframe(cursor)
         except Exception as e:
-            logger.error(f"Error executing query for snapshot {snapshot_id}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return []
+            logger.error("Error executing query for snapshot %s", snapshot_id, exc_info=True)
+            return pd.DataFrame()
 
-    def execute_query_for_snapshots(self, snapshot_ids: List[int]) -> List[Dict]:
+    def execute_query_for_snapshots(self, snapshot_ids: List[int]) -> pd.DataFrame:
         """
-        Fetch data for last 3 snapshots using a single query.
-        The query automatically gets the last 3 snapshots, so snapshot_ids parameter
-        is kept for compatibility but not used in the query.
+        Fetch data for the given snapshot IDs using a single query.
+        Binds the IDs into the SnapshotSet CTE so one round trip covers all of
+        them; with no IDs it falls back to the last-12-snapshots form.
+        Returns a DataFrame.
         """
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            # Query automatically gets last 3 snapshots, only needs ticker parameter
-            params = (self.ticker, self.ticker) if self.db_type == 'mysql' else (self.ticker, self.ticker)
-            cursor.execute(self.query_template, params)
-            rows = cursor.fetchall()
-            results = []
-            if self.db_type == 'mysql':
-                results = list(rows)
+            ranked = self._fetch_ranked(snapshot_ids)
+            if ranked is not None:
+                logger.info(f"Retrieved {len(ranked)} rows from pre-ranked table")
+                return ranked
+            if snapshot_ids:
+                params = (self.ticker, *snapshot_ids, self.ticker, self.ticker)
             else:
-                columns = [column[0] for column in cursor.description]
-                for row in rows:
-                    result_dict = dict(zip(columns, row))
-                    results.append(result_dict)
-            conn.close()
-            logger.info(f"Retrieved {len(results)} total rows for last 3 snapshots")
+                params = (self.ticker, self.ticker, self.ticker)
+            cursor = self._execute_statement(
+                self._render_query(self._snapshot_source(snapshot_ids)), params)
+            results = self._fetch_dataframe(cursor)
+            logger.info(f"Retrieved {len(results)} total rows for requested snapshots")
             return results
         except Exception as e:
-            logger.error(f"Error executing query for snapshots: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return []
+            logger.error("Error executing query for snapshots %s", snapshot_ids, exc_info=True)
+            return pd.DataFrame()
     
-    def save_results(self, results: List[Dict], snapshot_id: int):
+    def save_results(self, results, snapshot_id: int):
         """
         Save query results to a CSV file.
-        
+
         Args:
-            results: List of dictionaries containing query results
+            results: DataFrame (or list of dicts) containing query results
             snapshot_id: The snapshot ID for filename
         """
-        if not results:
+        if results is None or len(results) == 0:
             logger.warning(f"No results to save for snapshot {snapshot_id}")
             return
-        
-        import csv
-        
+
         # Create output directory if it doesn't exist
         output_dir = Path('output')
         output_dir.mkdir(exist_ok=True)
-        
+
         # Generate filename with timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = output_dir / f"snapshot_{snapshot_id}_{timestamp}.csv"
-        
-        # Write to CSV
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = results[0].keys()
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(results)
-        
+
+        if not isinstance(results, pd.DataFrame):
+            results = pd.DataFrame(results)
+
+        # C-implemented writer; same layout the old csv module path produced
+        results.to_csv(filename, index=False, lineterminator='\n')
+
         logger.info(f"Saved {len(results)} rows to {filename}")
+
+        # Also keep a Snappy-compressed Parquet copy, partitioned by snapshot,
+        # for downstream analysis tooling (much smaller and columnar).
+        if HAS_PYARROW:
+            try:
+                table = pa.Table.from_pandas(results, preserve_index=False)
+                pq.write_to_dataset(
+                    table,
+                    root_path=str(output_dir / 'options_data'),
+                    partition_cols=['SNAPSHOT_ID'],
+                    compression='snappy'
+                )
+                logger.debug("Saved Parquet copy for snapshot %s", snapshot_id)
+            except Exception as e:
+                logger.warning(f"Parquet write failed for snapshot {snapshot_id}: {e}")
     
     def collect_three_snapshots_timed(self, gap_seconds: int = 200) -> List[int]:
         """
@@ -714,21 +1121,33 @@ ORDER BY SNAPSHOT_ID, STRIKE
         snapshots = []
         attempts = 0
         max_attempts = 10  # Safety limit to avoid infinite loops
-        
+
+        # Fast path: snapshot ids are assigned sequentially, one per capture
+        # cycle, so three contiguous observed ids already span ~3-minute gaps.
+        # Reusing them skips the two gap waits and their round trips.
+        current = self.get_latest_snapshot_id()
+        self._note_snapshot(current)
+        recent = list(self._recent_snapshots)
+        if (current is not None and len(recent) == 3
+                and recent[0] - 1 == recent[1] and recent[1] - 1 == recent[2]):
+            logger.info(f"Reusing contiguous recent snapshots: {recent}")
+            return recent
+
         logger.info(f"Starting timed collection of 3 snapshots (gap: {gap_seconds}s = {gap_seconds/60:.1f} minutes)")
-        
+
         while len(snapshots) < 3 and attempts < max_attempts:
             sid = self.get_latest_snapshot_id()
-            
+
             if sid is None:
                 logger.warning(f"Attempt {attempts + 1}: No snapshot found, will retry after {gap_seconds}s wait")
             else:
                 # Only add if it's a new snapshot (different from last collected)
                 if not snapshots or sid != snapshots[-1]:
                     snapshots.append(sid)
+                    self._note_snapshot(sid)
                     logger.info(f"Collected snapshot ID: {sid} ({len(snapshots)}/3)")
                 else:
-                    logger.debug(f"Attempt {attempts + 1}: No new snapshot (still {sid}), will retry after {gap_seconds}s wait")
+                    logger.debug("Attempt %d: No new snapshot (still %s), will retry after %ss wait", attempts + 1, sid, gap_seconds)
             
             # If we have 3 snapshots, we're done
             if len(snapshots) >= 3:
@@ -757,48 +1176,75 @@ ORDER BY SNAPSHOT_ID, STRIKE
             return
         
         logger.info(f"Processing snapshots (combined): {snapshot_ids}")
-        
-        # Get strikes from the FIRST snapshot (oldest one, which is last in the list)
-        first_snapshot_id = snapshot_ids[-1]  # Oldest snapshot
-        underlying, strikes = self.get_strikes_for_snapshot(first_snapshot_id)
-        
-        if not strikes:
-            logger.warning(f"Could not determine strikes from first snapshot {first_snapshot_id}")
-            return
-        
-        logger.info(f"Using {len(strikes)} fixed strikes from snapshot {first_snapshot_id}: {strikes}")
-        
-        # Query all snapshots with these fixed strikes
-        results = self.execute_query_for_fixed_strikes(snapshot_ids, strikes)
-        
-        if results:
+
+        # One connection covers both the strike probe and the main fetch
+        conn = self.get_connection()
+        try:
+            # Get strikes from the FIRST snapshot (oldest one, which is last in the list)
+            first_snapshot_id = snapshot_ids[-1]  # Oldest snapshot
+            underlying, strikes = self.get_strikes_for_snapshot(
+                first_snapshot_id, cursor=conn.cursor())
+
+            if not strikes:
+                logger.warning(f"Could not determine strikes from first snapshot {first_snapshot_id}")
+                return
+
+            logger.info(f"Using {len(strikes)} fixed strikes from snapshot {first_snapshot_id}: {strikes}")
+
+            # Query all snapshots with these fixed strikes
+            results = self.execute_query_for_fixed_strikes(
+                snapshot_ids, strikes, cursor=conn.cursor())
+        finally:
+            conn.close()
+
+        if len(results):
             # Use the most recent snapshot id for filename reference
             latest_id = snapshot_ids[0]
+            self._arrival_times.append(time.monotonic())
+            self.invalidate_latest_snapshot_cache()
             self.save_results(results, latest_id)
-            
-            # Process signals and execute trades
-            self.process_signals_and_trades(snapshot_ids, latest_id)
+
+            # Process signals and execute trades on the in-memory frame,
+            # skipping the CSV round-trip through disk
+            self.process_signals_and_trades(snapshot_ids, latest_id, df_raw=results)
+
+            # One directory fsync covers the CSV (and any Parquet parts)
+            # written this cycle instead of flushing each file separately
+            try:
+                dir_fd = os.open('output', os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError as e:
+                logger.debug("Could not fsync output directory: %s", e)
     
+    def _get_portfolio(self):
+        """Return the shared PortfolioManager, creating it on first use."""
+        if self._portfolio_manager is None:
+            if not _HAS_SIGNAL_STACK:
+                raise ImportError("portfolio_manager/generate_signal not available")
+            self._portfolio_manager = PortfolioManager()
+        return self._portfolio_manager
+
     def update_portfolio_status(self):
         """
         Update portfolio status every minute and push to GitHub.
         This runs even when there are no new snapshots to keep portfolio value current.
         """
+        if not _HAS_SIGNAL_STACK:
+            logger.debug("Signal stack unavailable - skipping")
+            return
         try:
-            from portfolio_manager import PortfolioManager
-            from generate_signal import latest_output_file, load_csv, prepare_data, get_current_ltp
-            from pathlib import Path
-            
-            portfolio = PortfolioManager()
+            portfolio = self._get_portfolio()
             open_position = portfolio.get_open_position()
             
             if open_position:
                 # Get latest CSV to calculate current LTP
                 try:
-                    output_dir = Path('output')
-                    csv_path = latest_output_file(output_dir)
-                    df_raw = load_csv(csv_path)
-                    df_prep = prepare_data(df_raw)
+                    csv_path = latest_output_file(Path('output'))
+                    # Memoized on mtime: no re-parse when the file is unchanged
+                    df_prep = load_prepared(csv_path)
                     
                     current_ltp = get_current_ltp(
                         df_prep,
@@ -828,39 +1274,44 @@ ORDER BY SNAPSHOT_ID, STRIKE
                     logger.info(f"Portfolio Update: Cash={summary['cash']:.2f} (No data file available)")
                     portfolio._save_portfolio()
                 except Exception as e:
-                    logger.debug(f"Error updating portfolio status: {e}")
+                    logger.debug("Error updating portfolio status: %s", e)
             else:
                 # No open position, just log cash balance and sync
                 summary = portfolio.get_portfolio_summary()
                 logger.info(f"Portfolio Update: Cash={summary['cash']:.2f}, Total={summary['total_value']:.2f} (No open position)")
                 portfolio._save_portfolio()
         except Exception as e:
-            logger.debug(f"Error in portfolio status update: {e}")
+            logger.debug("Error in portfolio status update: %s", e)
     
-    def process_signals_and_trades(self, snapshot_ids: List[int], latest_snapshot_id: int):
+    def process_signals_and_trades(self, snapshot_ids: List[int], latest_snapshot_id: int,
+                                   df_raw: Optional[pd.DataFrame] = None):
         """
-        Generate signals from the latest CSV and execute trades via portfolio manager.
+        Generate signals and execute trades via portfolio manager.
+
+        Args:
+            snapshot_ids: Snapshot ids covered by this cycle (most recent first)
+            latest_snapshot_id: Most recent snapshot id, used for filenames
+            df_raw: Data just collected by process_snapshots; when omitted
+                    (standalone invocation) the latest CSV is read back instead
         """
+        if not _HAS_SIGNAL_STACK:
+            logger.debug("Signal stack unavailable - skipping")
+            return
         try:
-            from portfolio_manager import PortfolioManager
-            from generate_signal import latest_output_file, load_csv, prepare_data, evaluate_signal, get_current_ltp, aggregate_to_3min_snapshots
-            from pathlib import Path
-            
             # Initialize portfolio manager
-            portfolio = PortfolioManager()
-            
-            # Get the latest CSV file (should be the one we just saved)
-            output_dir = Path('output')
-            csv_path = latest_output_file(output_dir)
-            
-            logger.info(f"Processing signals from: {csv_path}")
-            
+            portfolio = self._get_portfolio()
+
+            if df_raw is None:
+                # Standalone call: read back the latest CSV we saved
+                csv_path = latest_output_file(Path('output'))
+                logger.info(f"Processing signals from: {csv_path}")
+                df_raw = load_csv(csv_path)
+            else:
+                logger.info("Processing signals from in-memory results")
+
             # Log initial portfolio value
             summary = portfolio.get_portfolio_summary()
             logger.info(f"Portfolio Value: {summary['total_value']:.2f} (Cash: {summary['cash']:.2f})")
-            
-            # Load raw data
-            df_raw = load_csv(csv_path)
 
             # Decide whether to aggregate to 3-minute snapshots
             df_tmp = df_raw.copy()
@@ -873,7 +1324,7 @@ ORDER BY SNAPSHOT_ID, STRIKE
             if unique_snapshots > 5:
                 # Aggregate high-frequency snapshots into 3-minute windows
                 df_prep = aggregate_to_3min_snapshots(df_raw)
-                agg_windows = df_prep.reset_index()["SNAPSHOT_SEQ"].nunique()
+                agg_windows = df_prep.index.get_level_values("SNAPSHOT_SEQ").nunique()
                 logger.info(f"Aggregated {unique_snapshots} snapshots into {agg_windows} 3-minute windows")
 
                 # Save aggregated snapshots alongside raw CSV
@@ -889,6 +1340,12 @@ ORDER BY SNAPSHOT_ID, STRIKE
             else:
                 # Fallback to direct preparation if few snapshots
                 df_prep = prepare_data(df_raw)
+
+            # SNAPSHOT_SEQ is the first index level and the frame is
+            # index-sorted; computing the latest seq once here replaces the
+            # reset_index copy + sort each use site paid before
+            seq_values = df_prep.index.get_level_values("SNAPSHOT_SEQ")
+            latest_snapshot_seq = int(seq_values.max()) if len(seq_values) else None
             
             # Check for open position - if exists, evaluate exit conditions
             open_position = portfolio.get_open_position()
@@ -905,8 +1362,8 @@ ORDER BY SNAPSHOT_ID, STRIKE
                 )
                 
                 # Get current snapshot_seq from dataframe (latest snapshot)
-                snap_seqs = sorted(df_prep.reset_index()["SNAPSHOT_SEQ"].unique())
-                current_snapshot_seq = snap_seqs[-1] if snap_seqs else open_position.get('snapshot_seq', 0)
+                current_snapshot_seq = (latest_snapshot_seq if latest_snapshot_seq is not None
+                                        else open_position.get('snapshot_seq', 0))
                 
                 # Evaluate exit conditions using the backtest logic
                 signal_result = evaluate_signal(
@@ -949,6 +1406,17 @@ ORDER BY SNAPSHOT_ID, STRIKE
             
             # Evaluate new buy signals (only if no open position)
             if not portfolio.has_open_position():
+                # Optional DB-side pre-filter: when the cycle is the standard
+                # 3-snapshot window and the server-side scan proves no
+                # contract passes the entry rules, skip the pandas pipeline
+                if self._db_signal_scan and snapshot_ids is not None and len(snapshot_ids) == 3:
+                    candidates = self.scan_signals_in_db(snapshot_ids)
+                    if candidates is not None and candidates.empty:
+                        logger.info("DB signal scan: no entry candidates this cycle")
+                        summary = portfolio.get_portfolio_summary()
+                        logger.info(f"Portfolio Value: {summary['total_value']:.2f} (Cash: {summary['cash']:.2f})")
+                        return
+
                 # Get last buy time for cooldown check (time-based)
                 last_buy_time = portfolio.get_last_buy_time()
                 signal_result = evaluate_signal(
@@ -963,8 +1431,7 @@ ORDER BY SNAPSHOT_ID, STRIKE
                     ltp = signal_result.get('ltp')
                     if ltp:
                         # Get current snapshot_seq for the buy
-                        snap_seqs = sorted(df_prep.reset_index()["SNAPSHOT_SEQ"].unique())
-                        current_snapshot_seq = snap_seqs[-1] if snap_seqs else 0
+                        current_snapshot_seq = latest_snapshot_seq if latest_snapshot_seq is not None else 0
                         
                         success, message = portfolio.buy(
                             signal_result['signal'],
@@ -1078,22 +1545,79 @@ ORDER BY SNAPSHOT_ID, STRIKE
             conn.close()
             
             if row:
-                if self.db_type == 'mysql':
-                    ltp = row[ltp_column] if isinstance(row, dict) else row[0]
-                else:
-                    ltp = row[0]
-                
+                ltp = row[0]
+
                 if ltp is not None:
-                    logger.debug(f"Fetched position LTP from DB: {ltp} for {signal_type} {expiry} {strike}")
+                    logger.debug("Fetched position LTP from DB: %s for %s %s %s", ltp, signal_type, expiry, strike)
                     return float(ltp)
             
-            logger.debug(f"No LTP found in DB for {signal_type} {expiry} {strike}")
+            logger.debug("No LTP found in DB for %s %s %s", signal_type, expiry, strike)
             return None
             
         except Exception as e:
-            logger.error(f"Error fetching position LTP from database: {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+            logger.error("Error fetching position LTP from database", exc_info=True)
+            return None
+
+    def scan_signals_in_db(self, snapshot_ids: List[int]) -> Optional[pd.DataFrame]:
+        """
+        Run the triple-snapshot entry rules in the database as a window query.
+
+        LAG over (EXPIRY, STRIKE ORDER BY SNAPSHOT_ID) lines up the t-2/t-1/t
+        values server-side, so only rows that pass the thresholds travel back
+        to Python — O(signals) transferred instead of O(rows). The scan covers
+        every expiry (a superset of the closest-expiry chain the Python path
+        evaluates) and ignores cooldown, so it is a pre-filter, not a
+        replacement: an empty result safely means "no entry possible this
+        cycle", a non-empty one hands off to evaluate_signal for the final
+        call. Opt in with DB_SIGNAL_SCAN=1.
+
+        Args:
+            snapshot_ids: Snapshot ids covered by this cycle
+
+        Returns:
+            DataFrame of candidate (EXPIRY, STRIKE, SIDE, LTP) rows, or None
+            when the scan could not run (callers should fall through)
+        """
+        if len(snapshot_ids) < 3:
+            return None
+        ids = sorted(snapshot_ids)[-3:]
+        p = '%s' if self.db_type == 'mysql' else '?'
+        over = "OVER (PARTITION BY EXPIRY, STRIKE ORDER BY SNAPSHOT_ID)"
+        call_cond = ("c_ltp0 IS NOT NULL AND c_LTP > c_ltp1 AND c_ltp1 > c_ltp0 "
+                     "AND c_LTP >= c_ltp0 * 1.03 AND c_OI >= c_oi1 AND c_ltp0 > 5 "
+                     "AND UNDERLYING_VALUE > under0")
+        put_cond = ("p_ltp0 IS NOT NULL AND p_LTP > p_ltp1 AND p_ltp1 > p_ltp0 "
+                    "AND p_LTP >= p_ltp0 * 1.03 AND p_OI >= p_oi1 AND p_ltp0 > 5 "
+                    "AND UNDERLYING_VALUE < under0")
+        # LAG is NULL on the first two rows of each partition, so only the
+        # newest snapshot's rows can satisfy either condition
+        query = f"""
+        SELECT EXPIRY, STRIKE,
+            CASE WHEN {call_cond} THEN 'CALL' ELSE 'PUT' END AS SIDE,
+            CASE WHEN {call_cond} THEN c_LTP ELSE p_LTP END AS LTP
+        FROM (
+            SELECT EXPIRY, STRIKE, UNDERLYING_VALUE,
+                c_LTP, c_OI, p_LTP, p_OI,
+                LAG(c_LTP, 1) {over} AS c_ltp1,
+                LAG(c_LTP, 2) {over} AS c_ltp0,
+                LAG(c_OI, 1) {over} AS c_oi1,
+                LAG(p_LTP, 1) {over} AS p_ltp1,
+                LAG(p_LTP, 2) {over} AS p_ltp0,
+                LAG(p_OI, 1) {over} AS p_oi1,
+                LAG(UNDERLYING_VALUE, 2) {over} AS under0
+            FROM optionchain_combined
+            WHERE TICKER = {p} AND SNAPSHOT_ID IN ({','.join([p] * len(ids))})
+        ) lagged
+        WHERE ({call_cond}) OR ({put_cond})
+        """
+        try:
+            with self._session() as cur:
+                cur.execute(query, (self.ticker, *ids))
+                df = self._fetch_dataframe(cur)
+            logger.debug("DB signal scan over snapshots %s: %d candidate(s)", ids, len(df))
+            return df
+        except Exception as e:
+            logger.warning(f"DB signal scan failed, falling back to local evaluation: {e}")
             return None
 
     def update_position_price(self):
@@ -1102,11 +1626,11 @@ ORDER BY SNAPSHOT_ID, STRIKE
         Also checks stop loss condition and executes sell if triggered.
         This runs independently of snapshot collection.
         """
+        if not _HAS_SIGNAL_STACK:
+            logger.debug("Signal stack unavailable - skipping")
+            return
         try:
-            from portfolio_manager import PortfolioManager
-            from generate_signal import DEFAULT_STOP_LOSS_PCT
-            
-            portfolio = PortfolioManager()
+            portfolio = self._get_portfolio()
             open_position = portfolio.get_open_position()
             
             if not open_position:
@@ -1164,9 +1688,7 @@ ORDER BY SNAPSHOT_ID, STRIKE
                 logger.warning(f"Could not fetch position LTP from database for {open_position['type']} {open_position['expiry']} {open_position['strike']}")
                 
         except Exception as e:
-            logger.error(f"Error updating position price: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.error("Error updating position price", exc_info=True)
     
     def get_cooldown_remaining_minutes(self) -> Optional[float]:
         """
@@ -1175,11 +1697,10 @@ ORDER BY SNAPSHOT_ID, STRIKE
         Returns:
             Remaining cooldown minutes if cooldown is active, None if no cooldown
         """
+        if not _HAS_SIGNAL_STACK:
+            return None
         try:
-            from portfolio_manager import PortfolioManager
-            from generate_signal import DEFAULT_COOLDOWN_MINUTES
-            
-            portfolio = PortfolioManager()
+            portfolio = self._get_portfolio()
             last_buy_time = portfolio.get_last_buy_time()
             
             if not last_buy_time:
@@ -1210,9 +1731,7 @@ ORDER BY SNAPSHOT_ID, STRIKE
             return max(0, remaining_minutes)  # Ensure non-negative
             
         except Exception as e:
-            logger.debug(f"Error calculating cooldown: {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+            logger.debug("Error calculating cooldown", exc_info=True)
             return None
     
     def test_connection(self) -> bool:
@@ -1231,46 +1750,45 @@ ORDER BY SNAPSHOT_ID, STRIKE
             logger.info(f"User: {self.config['user']}")
             logger.info(f"Ticker: {self.ticker}")
             
-            # Test connection
-            logger.info("\n1. Testing database connection...")
-            conn = self.get_connection()
-            logger.info("✓ Connection successful!")
-            conn.close()
-            
-            # Test getting latest snapshot ID
-            logger.info("\n2. Testing latest snapshot ID retrieval...")
-            latest_snapshot_id = self.get_latest_snapshot_id()
-            if latest_snapshot_id:
-                logger.info(f"✓ Latest snapshot ID: {latest_snapshot_id}")
-            else:
-                logger.warning("⚠ No snapshots found in database")
-                return False
-            
-            # Test getting last 3 snapshot IDs
-            logger.info("\n3. Testing last 3 snapshot IDs retrieval...")
-            snapshot_ids = self.get_snapshot_ids(limit=3)
-            if snapshot_ids:
-                logger.info(f"✓ Last 3 snapshot IDs: {snapshot_ids}")
-            else:
-                logger.warning("⚠ No snapshot IDs retrieved")
-                return False
+            # Steps 1-3 share one session: a single handshake instead of three
+            with self._session() as cur:
+                # Test connection
+                logger.info("\n1. Testing database connection...")
+                logger.info("✓ Connection successful!")
+
+                # Test getting latest snapshot ID
+                logger.info("\n2. Testing latest snapshot ID retrieval...")
+                latest_snapshot_id = self.get_latest_snapshot_id(cursor=cur)
+                if latest_snapshot_id:
+                    logger.info(f"✓ Latest snapshot ID: {latest_snapshot_id}")
+                else:
+                    logger.warning("⚠ No snapshots found in database")
+                    return False
+
+                # Test getting last 3 snapshot IDs
+                logger.info("\n3. Testing last 3 snapshot IDs retrieval...")
+                snapshot_ids = self.get_snapshot_ids(limit=3, cursor=cur)
+                if snapshot_ids:
+                    logger.info(f"✓ Last 3 snapshot IDs: {snapshot_ids}")
+                else:
+                    logger.warning("⚠ No snapshot IDs retrieved")
+                    return False
             
             # Test executing the main query
             logger.info("\n4. Testing main SQL query execution...")
             logger.info("   (This may take a few seconds...)")
             results = self.execute_query_for_snapshots(snapshot_ids)
-            
-            if results:
+
+            if len(results):
                 logger.info(f"✓ Query executed successfully!")
                 logger.info(f"✓ Retrieved {len(results)} rows")
-                
+
                 # Show sample data
-                if len(results) > 0:
-                    logger.info("\n5. Sample data (first row):")
-                    sample = results[0]
-                    for key, value in list(sample.items())[:5]:  # Show first 5 columns
-                        logger.info(f"   {key}: {value}")
-                    logger.info(f"   ... ({len(sample)} total columns)")
+                logger.info("\n5. Sample data (first row):")
+                sample = results.iloc[0]
+                for key, value in list(sample.items())[:5]:  # Show first 5 columns
+                    logger.info(f"   {key}: {value}")
+                logger.info(f"   ... ({len(results.columns)} total columns)")
             else:
                 logger.warning("⚠ Query executed but returned no results")
                 return False
@@ -1287,9 +1805,7 @@ ORDER BY SNAPSHOT_ID, STRIKE
             logger.error("  venv\\Scripts\\activate     # Windows")
             return False
         except Exception as e:
-            logger.error(f"✗ Connection test failed: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.error(f"✗ Connection test failed: {e}", exc_info=True)
             logger.error("\nTroubleshooting:")
             logger.error("1. Check your credentials in credentials.sh or credentials.bat")
             logger.error("2. Make sure you've sourced the credentials: source credentials.sh")
@@ -1340,15 +1856,14 @@ ORDER BY SNAPSHOT_ID, STRIKE
         
         # Check for open positions from previous session
         try:
-            from portfolio_manager import PortfolioManager
-            portfolio = PortfolioManager()
+            portfolio = self._get_portfolio()
             open_position = portfolio.get_open_position()
             if open_position:
                 logger.info(f"Resuming with open position: {open_position['type']} {open_position['expiry']} {open_position['strike']}")
                 logger.info(f"Position entered: {open_position.get('entry_time', 'Unknown')}")
                 logger.info("Mode: Position monitoring (updates every 60 seconds, no snapshot collection)")
         except Exception as e:
-            logger.debug(f"Could not check portfolio: {e}")
+            logger.debug("Could not check portfolio: %s", e)
         
         # Initialize with current latest snapshot
         self.last_snapshot_id = self.get_latest_snapshot_id()
@@ -1363,9 +1878,14 @@ ORDER BY SNAPSHOT_ID, STRIKE
         
         last_position_update = time.time()
         last_snapshot_collection = time.time()
-        
+
+        # Adaptive poll cadence: shrink after activity, back off (bounded)
+        # while idle so quiet periods don't keep polling at full rate
+        poll_interval = check_interval
+        idle_polls = 0
+
         try:
-            while True:
+            while not self._stop.is_set():
                 # Check if still in trading hours
                 if not is_trading_time():
                     ist_now = get_ist_now()
@@ -1374,8 +1894,7 @@ ORDER BY SNAPSHOT_ID, STRIKE
                         
                         # Check if there's an open position to carry forward (no forced sells)
                         try:
-                            from portfolio_manager import PortfolioManager
-                            portfolio = PortfolioManager()
+                            portfolio = self._get_portfolio()
                             open_position = portfolio.get_open_position()
                             if open_position:
                                 logger.info(f"Carrying forward open position: {open_position['type']} {open_position['expiry']} {open_position['strike']}")
@@ -1395,12 +1914,12 @@ ORDER BY SNAPSHOT_ID, STRIKE
                 
                 # Check portfolio status
                 try:
-                    from portfolio_manager import PortfolioManager
-                    portfolio = PortfolioManager()
+                    portfolio = self._get_portfolio()
                     has_position = portfolio.has_open_position()
                 except Exception as e:
                     logger.error(f"Error checking portfolio: {e}")
-                    time.sleep(check_interval)
+                    if self._stop.wait(check_interval):
+                        break
                     continue
                 
                 if has_position:
@@ -1416,6 +1935,14 @@ ORDER BY SNAPSHOT_ID, STRIKE
                     
                     # ALSO run snapshot collection every 3 minutes (for sell signal evaluation)
                     if current_time - last_snapshot_collection >= SNAPSHOT_INTERVAL:
+                        if not self._new_snapshot_available():
+                            # Nothing newer than the last processed snapshot;
+                            # re-probe on the next wake instead of collecting
+                            logger.debug("No new snapshot yet - skipping collection cycle")
+                            new_id = self.wait_for_new_snapshot(poll_interval)
+                            if new_id is not None:
+                                self._record_event_snapshot(new_id)
+                            continue
                         logger.info("=" * 60)
                         logger.info("Starting scheduled snapshot collection (every 3 minutes) - Checking sell conditions")
                         logger.info("=" * 60)
@@ -1448,7 +1975,8 @@ ORDER BY SNAPSHOT_ID, STRIKE
                         sleep_chunk = min(sleep_seconds, 60)  # Sleep in 60-second chunks
                         slept = 0
                         while slept < sleep_seconds:
-                            time.sleep(sleep_chunk)
+                            if self._stop.wait(sleep_chunk):
+                                break
                             slept += sleep_chunk
                             
                             # Check trading hours during sleep
@@ -1467,6 +1995,12 @@ ORDER BY SNAPSHOT_ID, STRIKE
                     
                     # Cooldown < 9 minutes or not active - Fetch snapshots normally
                     if current_time - last_snapshot_collection >= SNAPSHOT_INTERVAL:
+                        if not self._new_snapshot_available():
+                            logger.debug("No new snapshot yet - skipping collection cycle")
+                            new_id = self.wait_for_new_snapshot(poll_interval)
+                            if new_id is not None:
+                                self._record_event_snapshot(new_id)
+                            continue
                         cooldown_status = ""
                         if cooldown_remaining is not None:
                             cooldown_status = f" (Cooldown: {cooldown_remaining:.1f} min remaining)"
@@ -1490,8 +2024,23 @@ ORDER BY SNAPSHOT_ID, STRIKE
                         
                         last_snapshot_collection = current_time
                 
-                # Wait before next check
-                time.sleep(check_interval)
+                # Wait before next check (event-driven when snapshot_events is installed)
+                new_id = self.wait_for_new_snapshot(poll_interval)
+                if new_id is not None:
+                    self._record_event_snapshot(new_id)
+                    logger.debug("Snapshot event received: %s", new_id)
+                    idle_polls = 0
+                    # Align the next poll with the observed feed cadence so a
+                    # fast feed is caught quickly and a slow one isn't spammed
+                    cadence = self._estimated_cadence()
+                    if cadence is not None:
+                        poll_interval = max(5, min(check_interval, 0.8 * cadence))
+                    else:
+                        poll_interval = max(5, check_interval // 4)
+                else:
+                    idle_polls += 1
+                    poll_interval = min(check_interval * 4,
+                                        check_interval * (1 << min(idle_polls, 2)))
                 
         except KeyboardInterrupt:
             logger.info("Monitoring stopped by user")
@@ -4,6 +4,7 @@ Supports both SQL Server and MySQL.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional, Dict
 
 
@@ -36,8 +37,21 @@ def get_connection_config() -> Dict:
     Returns:
         Dictionary with connection parameters
     """
+    return dict(_build_connection_config())
+
+
+@lru_cache(maxsize=1)
+def _build_connection_config() -> Dict:
+    """
+    Read the environment once and build the config dict.
+
+    Cached for the life of the process: credentials don't change while the
+    monitor runs, so repeat callers skip the env lookups. Environment
+    mutations after the first call have no effect. get_connection_config
+    hands out a fresh copy so callers can't mutate the cached dict.
+    """
     db_type = get_db_type()
-    
+
     config = {
         'type': db_type,
         'host': os.getenv('DB_SERVER', '34.93.144.87'),
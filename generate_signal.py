@@ -7,6 +7,7 @@ snapshots (combined), runs the provided signal rules, and prints the signal.
 
 import argparse
 import json
+import os
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -15,6 +16,12 @@ from typing import Tuple, Dict, List, Optional
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 # ---------------------------
 # Config / Default Parameters
 # ---------------------------
@@ -28,6 +35,21 @@ DEFAULT_COOLDOWN_MINUTES = 50  # Cooldown period in minutes from first buy
 # ---------------------------
 # Data Preparation
 # ---------------------------
+def _build_timestamp(df: pd.DataFrame) -> pd.Series:
+    """
+    TIMESTAMP from DOWNLOAD_DATE + DOWNLOAD_TIME in a single C parse.
+
+    One fast-path strptime pass over the concatenated strings; cache=True
+    dedupes the handful of distinct snapshot stamps across the thousands
+    of rows. Unexpected source formats fall back to autodetection.
+    """
+    stamp = df["DOWNLOAD_DATE"].astype(str) + " " + df["DOWNLOAD_TIME"].astype(str)
+    try:
+        return pd.to_datetime(stamp, format="%Y-%m-%d %H:%M:%S", cache=True)
+    except ValueError:
+        return pd.to_datetime(stamp)
+
+
 def prepare_data(df: pd.DataFrame) -> pd.DataFrame:
     required_cols = [
         "DOWNLOAD_DATE", "DOWNLOAD_TIME", "SNAPSHOT_ID",
@@ -37,11 +59,13 @@ def prepare_data(df: pd.DataFrame) -> pd.DataFrame:
     if missing:
         raise ValueError(f"Missing columns: {missing}")
 
-    df["DOWNLOAD_DATE"] = pd.to_datetime(df["DOWNLOAD_DATE"]).dt.date
-    df["DOWNLOAD_TIME"] = pd.to_datetime(df["DOWNLOAD_TIME"], format="%H:%M:%S").dt.time
-    df["TIMESTAMP"] = pd.to_datetime(
-        df["DOWNLOAD_DATE"].astype(str) + " " + df["DOWNLOAD_TIME"].astype(str)
-    )
+    df["TIMESTAMP"] = _build_timestamp(df)
+    # Midnight-normalized datetime64 stays a native column (and merge key)
+    # instead of boxing every row into Python date objects; it still
+    # renders date-only in astype(str) and to_csv, so the agg-CSV
+    # round-trip through this function is unchanged
+    df["DOWNLOAD_DATE"] = df["TIMESTAMP"].dt.normalize()
+    df["DOWNLOAD_TIME"] = df["TIMESTAMP"].dt.time
     # Sort by TIMESTAMP to ensure chronological order (not SNAPSHOT_ID)
     df = df.sort_values(["TIMESTAMP", "STRIKE"]).reset_index(drop=True)
 
@@ -53,8 +77,14 @@ def prepare_data(df: pd.DataFrame) -> pd.DataFrame:
                   on=["DOWNLOAD_DATE", "SNAPSHOT_ID"], how="left")
 
     df["STRIKE"] = df["STRIKE"].astype(float)
-    df["EXPIRY"] = df["EXPIRY"].astype(str)
+    # A handful of distinct expiries per chain: Categorical stores small int
+    # codes in the index level instead of one Python string per row, and
+    # groupby/pivot key on the codes. Lookups still take plain strings.
+    df["EXPIRY"] = df["EXPIRY"].astype(str).astype("category")
     df = df.set_index(["SNAPSHOT_SEQ", "EXPIRY", "STRIKE"]).sort_index()
+    # Per-frame cache of the ordered snapshot seqs; the evaluate paths read
+    # this several times per tick (see _snap_seqs)
+    df.attrs["snap_seqs"] = df.index.get_level_values("SNAPSHOT_SEQ").unique()
     return df
 
 
@@ -74,11 +104,9 @@ def aggregate_to_3min_snapshots(df: pd.DataFrame) -> pd.DataFrame:
         raise ValueError(f"Missing columns for aggregation: {missing}")
 
     df_r = df.copy()
-    df_r["DOWNLOAD_DATE"] = pd.to_datetime(df_r["DOWNLOAD_DATE"]).dt.date
-    df_r["DOWNLOAD_TIME"] = pd.to_datetime(df_r["DOWNLOAD_TIME"], format="%H:%M:%S").dt.time
-    df_r["TIMESTAMP"] = pd.to_datetime(
-        df_r["DOWNLOAD_DATE"].astype(str) + " " + df_r["DOWNLOAD_TIME"].astype(str)
-    )
+    # The old per-column date and time parses only fed this concatenation;
+    # prepare_data re-derives both columns from TIMESTAMP afterwards anyway
+    df_r["TIMESTAMP"] = _build_timestamp(df_r)
 
     # Sort chronologically
     df_r = df_r.sort_values("TIMESTAMP").reset_index(drop=True)
@@ -87,16 +115,10 @@ def aggregate_to_3min_snapshots(df: pd.DataFrame) -> pd.DataFrame:
     t0 = df_r["TIMESTAMP"].iloc[0]
     df_r["WINDOW"] = ((df_r["TIMESTAMP"] - t0).dt.total_seconds() // 180).astype(int)
 
-    aggregated_rows = []
-    for window_id in sorted(df_r["WINDOW"].unique()):
-        window_data = df_r[df_r["WINDOW"] == window_id]
-        if window_data.empty:
-            continue
-        # Take the last timestamp in this 3-minute window
-        last_row = window_data.sort_values("TIMESTAMP").iloc[-1]
-        aggregated_rows.append(last_row[required_cols])
-
-    df_agg = pd.DataFrame(aggregated_rows)
+    # The frame is already time-sorted, so tail(1) per window is exactly the
+    # old per-window sort + iloc[-1], done in one C groupby pass instead of
+    # a Python loop filtering the frame once per window
+    df_agg = df_r.groupby("WINDOW", sort=True).tail(1)[required_cols]
     # Reuse prepare_data to build SNAPSHOT_SEQ and index
     return prepare_data(df_agg)
 
@@ -104,21 +126,71 @@ def aggregate_to_3min_snapshots(df: pd.DataFrame) -> pd.DataFrame:
 # ---------------------------
 # Signal Generation
 # ---------------------------
+def _pivot_features(df: pd.DataFrame):
+    """
+    Pivot the prepared frame into dense snapshot × (expiry, strike) matrices.
+
+    Returns (pivot, under) where pivot holds the four LTP/OI feature blocks
+    (pivot["c_LTP"] etc., columns sorted by expiry then strike — the same
+    order the row loop used to walk) and under is the per-snapshot
+    underlying value as a plain ndarray aligned with pivot.index, so the
+    trend checks index it positionally with no Series hashing. Missing
+    (snapshot, expiry, strike) cells become NaN, which fail every
+    comparison just like the old key-existence check.
+    """
+    df_r = df.reset_index()
+    pivot = df_r.pivot_table(
+        index="SNAPSHOT_SEQ",
+        columns=["EXPIRY", "STRIKE"],
+        values=["c_LTP", "c_OI", "p_LTP", "p_OI"],
+        aggfunc="first",
+    ).sort_index()
+    under = (df_r.groupby("SNAPSHOT_SEQ")["UNDERLYING_VALUE"].first()
+             .sort_index().to_numpy())
+    return pivot, under
+
+
+def _apply_cooldown(seqs: np.ndarray, cooldown: int) -> np.ndarray:
+    """
+    Greedy cooldown filter: boolean keep-mask over sorted candidate seqs.
+
+    Keeps a seq only when it is more than ``cooldown`` after the last kept
+    one. The chain is inherently sequential (each decision depends on the
+    previously kept value, so it cannot be a single np.diff reduction), but
+    it runs over the sparse candidate list only — a handful of ints per
+    call — and being a pure array kernel it is trivially JIT-able.
+    """
+    keep = np.zeros(len(seqs), dtype=np.bool_)
+    last = -9999
+    for i in range(len(seqs)):
+        if seqs[i] - last > cooldown:
+            keep[i] = True
+            last = seqs[i]
+    return keep
+
+
+if HAS_NUMBA:
+    # Compile the kernel to native code; falls back to the plain-Python
+    # loop above when numba isn't installed. cache=True persists the
+    # compiled function so the first poll of the day doesn't pay JIT cost.
+    _apply_cooldown = njit(cache=True)(_apply_cooldown)
+
+
 def generate_signals(df: pd.DataFrame, strike_step=DEFAULT_STRIKE_STEP, cooldown_snapshots=20, debug=False):
     """
     Generate call/put buy signals over the snapshot sequence.
-    Now checks all strikes in the dataframe, not just ATM±1.
+
+    All (snapshot, expiry, strike) triples are evaluated at once as
+    elementwise boolean operations on the pivoted feature matrices; only the
+    sparse set of passing cells is then walked in order for the cooldown
+    bookkeeping, so the per-row df.loc interpreter loop is gone.
     """
     import logging
     logger = logging.getLogger(__name__)
-    
+
     call_buy_signals, put_buy_signals = {}, {}
-    df_r = df.reset_index()
-    snap_list = sorted(df_r["SNAPSHOT_SEQ"].unique())
-    under_by_snap = df_r.groupby("SNAPSHOT_SEQ")["UNDERLYING_VALUE"].first()
-    exps_by_snap = df_r.groupby("SNAPSHOT_SEQ")["EXPIRY"].unique()
-    last_call_entry_snap = -9999
-    last_put_entry_snap = -9999
+    pivot, under = _pivot_features(df)
+    snap_list = list(pivot.index)
 
     if len(snap_list) < 3:
         logger.info(f"Not enough snapshots for signal generation: {len(snap_list)} < 3")
@@ -126,164 +198,131 @@ def generate_signals(df: pd.DataFrame, strike_step=DEFAULT_STRIKE_STEP, cooldown
 
     logger.info(f"Generating signals across {len(snap_list)} snapshots: {snap_list}")
 
-    for idx in range(len(snap_list) - 2):
-        t0, t1, t2 = snap_list[idx], snap_list[idx + 1], snap_list[idx + 2]
-        try:
-            u0, u1, u2 = under_by_snap.loc[t0], under_by_snap.loc[t1], under_by_snap.loc[t2]
-            underlying_increasing = (u2 > u0)  # For CALL: underlying should increase
-            underlying_decreasing = (u2 < u0)  # For PUT: underlying should decrease
-            logger.info(f"Snapshot sequence {t0}->{t1}->{t2}: Underlying {u0:.2f}->{u1:.2f}->{u2:.2f}, "
-                       f"Increasing={underlying_increasing}, Decreasing={underlying_decreasing}")
-        except KeyError:
-            underlying_increasing = False
-            underlying_decreasing = False
-            logger.warning(f"Missing underlying data for snapshots {t0}, {t1}, or {t2}")
-            continue
-
-        for exp in exps_by_snap.loc[t0]:
-            # Get all available strikes for this expiry at t0
-            t0_strikes = df_r[(df_r["SNAPSHOT_SEQ"] == t0) & (df_r["EXPIRY"] == exp)]["STRIKE"].unique()
-            logger.info(f"Checking {len(t0_strikes)} strikes for expiry {exp} across snapshots {t0}->{t1}->{t2}")
-            
-            for strike in t0_strikes:
-                key0, key1, key2 = (t0, exp, strike), (t1, exp, strike), (t2, exp, strike)
-                if key0 not in df.index or key1 not in df.index or key2 not in df.index:
-                    continue
-                r0, r1, r2 = df.loc[key0], df.loc[key1], df.loc[key2]
-
-                # CALL ENTRY - requires underlying to increase (t2 > t0)
-                if underlying_increasing:
-                    call_conditions = {
-                        "underlying_increasing": underlying_increasing,
-                        "ltp_increasing": r2["c_LTP"] > r1["c_LTP"] > r0["c_LTP"],
-                        "ltp_3pct_move": r2["c_LTP"] >= r0["c_LTP"] * 1.03,
-                        "oi_5pct_growth": r2["c_OI"] >= r1["c_OI"],
-                        "ltp_gt_5": r0["c_LTP"] > 5,
-                        "cooldown_ok": t2 - last_call_entry_snap > cooldown_snapshots
-                    }
-                    
-                    # Log detailed condition check
-                    ltp_move_pct = ((r2["c_LTP"] / r0["c_LTP"]) - 1) * 100 if r0["c_LTP"] > 0 else 0
-                    oi_growth_pct = ((r2["c_OI"] / r1["c_OI"]) - 1) * 100 if r1["c_OI"] > 0 else 0
-                    
-                    failed_conditions = [k for k, v in call_conditions.items() if not v]
-                    
-                    # Log all strikes with detailed failure reasons
-                    if failed_conditions:
-                        logger.info(f"CALL {strike}: FAILED")
-                        # Show specific failure reasons with actual values
-                        if not call_conditions["ltp_increasing"]:
-                            ltp_trend = "increasing" if r2["c_LTP"] > r1["c_LTP"] > r0["c_LTP"] else "NOT increasing"
-                            logger.info(f"  ❌ LTP trend: {ltp_trend} (values: {r0['c_LTP']:.2f}->{r1['c_LTP']:.2f}->{r2['c_LTP']:.2f})")
-                        else:
-                            logger.info(f"  ✓ LTP increasing: {r0['c_LTP']:.2f}->{r1['c_LTP']:.2f}->{r2['c_LTP']:.2f}")
-                        
-                        if not call_conditions["ltp_3pct_move"]:
-                            logger.info(f"  ❌ LTP move: {ltp_move_pct:.2f}% (need >=3%, got {ltp_move_pct:.2f}%)")
-                        else:
-                            logger.info(f"  ✓ LTP move: {ltp_move_pct:.2f}%")
-                        
-                        if not call_conditions["oi_5pct_growth"]:
-                            logger.info(f"  ❌ OI growth t1->t2: {oi_growth_pct:.2f}% (need >=5%, got {oi_growth_pct:.2f}%)")
-                            logger.info(f"     OI values: {r0['c_OI']:.0f}->{r1['c_OI']:.0f}->{r2['c_OI']:.0f}")
-                        else:
-                            logger.info(f"  ✓ OI growth: {oi_growth_pct:.2f}% (OI: {r0['c_OI']:.0f}->{r1['c_OI']:.0f}->{r2['c_OI']:.0f})")
-                        
-                        if not call_conditions["ltp_gt_5"]:
-                            logger.info(f"  ❌ LTP > 5: {r0['c_LTP']:.2f} (need >5)")
-                        else:
-                            logger.info(f"  ✓ LTP > 5: {r0['c_LTP']:.2f}")
-                        
-                        if not call_conditions["cooldown_ok"]:
-                            logger.info(f"  ❌ Cooldown: {t2 - last_call_entry_snap} snapshots since last buy (need >{cooldown_snapshots})")
-                    else:
-                        logger.info(f"CALL {strike}: ALL CONDITIONS MET!")
-                        logger.info(f"  LTP: {r0['c_LTP']:.2f}->{r1['c_LTP']:.2f}->{r2['c_LTP']:.2f} "
-                                  f"({ltp_move_pct:.2f}% move)")
-                        logger.info(f"  OI: {r0['c_OI']:.0f}->{r1['c_OI']:.0f}->{r2['c_OI']:.0f} "
-                                  f"({oi_growth_pct:.2f}% growth t1->t2)")
-                    
-                    if all(call_conditions.values()):
-                        call_buy_signals[t2] = (exp, strike)
-                        last_call_entry_snap = t2
-                        logger.info(f"✓ CALL BUY signal generated at snapshot {t2}: {exp} {strike}, LTP={r2['c_LTP']:.2f}")
-
-                # PUT ENTRY - requires underlying to decrease (t2 < t0)
-                if underlying_decreasing:
-                    put_conditions = {
-                        "underlying_decreasing": underlying_decreasing,
-                        "ltp_increasing": r2["p_LTP"] > r1["p_LTP"] > r0["p_LTP"],
-                        "ltp_3pct_move": r2["p_LTP"] >= r0["p_LTP"] * 1.03,
-                        "oi_5pct_growth": r2["p_OI"] >= r1["p_OI"],
-                        "ltp_gt_5": r0["p_LTP"] > 5,
-                        "cooldown_ok": t2 - last_put_entry_snap > cooldown_snapshots
-                    }
-                    
-                    # Log detailed condition check
-                    ltp_move_pct = ((r2["p_LTP"] / r0["p_LTP"]) - 1) * 100 if r0["p_LTP"] > 0 else 0
-                    oi_growth_pct = ((r2["p_OI"] / r1["p_OI"]) - 1) * 100 if r1["p_OI"] > 0 else 0
-                    
-                    failed_conditions = [k for k, v in put_conditions.items() if not v]
-                    
-                    # Log all strikes with detailed failure reasons
-                    if failed_conditions:
-                        logger.info(f"PUT {strike}: FAILED")
-                        # Show specific failure reasons with actual values
-                        if not put_conditions["ltp_increasing"]:
-                            ltp_trend = "increasing" if r2["p_LTP"] > r1["p_LTP"] > r0["p_LTP"] else "NOT increasing"
-                            logger.info(f"  ❌ LTP trend: {ltp_trend} (values: {r0['p_LTP']:.2f}->{r1['p_LTP']:.2f}->{r2['p_LTP']:.2f})")
-                        else:
-                            logger.info(f"  ✓ LTP increasing: {r0['p_LTP']:.2f}->{r1['p_LTP']:.2f}->{r2['p_LTP']:.2f}")
-                        
-                        if not put_conditions["ltp_3pct_move"]:
-                            logger.info(f"  ❌ LTP move: {ltp_move_pct:.2f}% (need >=3%, got {ltp_move_pct:.2f}%)")
-                        else:
-                            logger.info(f"  ✓ LTP move: {ltp_move_pct:.2f}%")
-                        
-                        if not put_conditions["oi_5pct_growth"]:
-                            logger.info(f"  ❌ OI growth t1->t2: {oi_growth_pct:.2f}% (need >=5%, got {oi_growth_pct:.2f}%)")
-                            logger.info(f"     OI values: {r0['p_OI']:.0f}->{r1['p_OI']:.0f}->{r2['p_OI']:.0f}")
-                        else:
-                            logger.info(f"  ✓ OI growth: {oi_growth_pct:.2f}% (OI: {r0['p_OI']:.0f}->{r1['p_OI']:.0f}->{r2['p_OI']:.0f})")
-                        
-                        if not put_conditions["ltp_gt_5"]:
-                            logger.info(f"  ❌ LTP > 5: {r0['p_LTP']:.2f} (need >5)")
-                        else:
-                            logger.info(f"  ✓ LTP > 5: {r0['p_LTP']:.2f}")
-                        
-                        if not put_conditions["cooldown_ok"]:
-                            logger.info(f"  ❌ Cooldown: {t2 - last_put_entry_snap} snapshots since last buy (need >{cooldown_snapshots})")
-                    else:
-                        logger.info(f"PUT {strike}: ALL CONDITIONS MET!")
-                        logger.info(f"  LTP: {r0['p_LTP']:.2f}->{r1['p_LTP']:.2f}->{r2['p_LTP']:.2f} "
-                                  f"({ltp_move_pct:.2f}% move)")
-                        logger.info(f"  OI: {r0['p_OI']:.0f}->{r1['p_OI']:.0f}->{r2['p_OI']:.0f} "
-                                  f"({oi_growth_pct:.2f}% growth t1->t2)")
-                    
-                    if all(put_conditions.values()):
-                        put_buy_signals[t2] = (exp, strike)
-                        last_put_entry_snap = t2
-                        logger.info(f"✓ PUT BUY signal generated at snapshot {t2}: {exp} {strike}, LTP={r2['p_LTP']:.2f}")
+    cols = pivot["c_LTP"].columns  # (EXPIRY, STRIKE) pairs, sorted
+    # Column-major layout: the t-2/t-1/t comparisons read down the
+    # SNAPSHOT_SEQ axis per contract, so keeping each (expiry, strike)
+    # column contiguous uses cache lines instead of striding across rows.
+    # float32 halves the bytes those comparisons stream — the rules are
+    # coarse ratio checks, well within FP32 precision (OI stays float so
+    # NaN keeps marking absent contracts)
+    c_ltp = np.asfortranarray(pivot["c_LTP"].to_numpy(np.float32))
+    c_oi = np.asfortranarray(pivot["c_OI"].to_numpy(np.float32))
+    p_ltp = np.asfortranarray(pivot["p_LTP"].to_numpy(np.float32))
+    p_oi = np.asfortranarray(pivot["p_OI"].to_numpy(np.float32))
+    u = under.astype(np.float32)
+
+    # Rolling 3-snapshot windows: row w covers (t0, t1, t2) =
+    # (snap_list[w], snap_list[w+1], snap_list[w+2])
+    underlying_increasing = u[2:] > u[:-2]  # For CALL: underlying should increase
+    underlying_decreasing = u[2:] < u[:-2]  # For PUT: underlying should decrease
+    if logger.isEnabledFor(logging.INFO):
+        # Per-window trace: skip the whole formatting loop when INFO is off
+        for w in range(len(snap_list) - 2):
+            logger.info("Snapshot sequence %s->%s->%s: Underlying %.2f->%.2f->%.2f, "
+                        "Increasing=%s, Decreasing=%s",
+                        snap_list[w], snap_list[w + 1], snap_list[w + 2],
+                        u[w], u[w + 1], u[w + 2],
+                        underlying_increasing[w], underlying_decreasing[w])
+
+    def _entry_mask(ltp, oi, trend):
+        l0, l1, l2 = ltp[:-2], ltp[1:-1], ltp[2:]
+        oi1, oi2 = oi[1:-1], oi[2:]
+        mask = (
+            (l2 > l1) & (l1 > l0)        # ltp_increasing
+            & (l2 >= l0 * np.float32(1.03))  # ltp_3pct_move, no float64 upcast
+            & (oi2 >= oi1)               # oi growth t1->t2
+            & (l0 > 5)                   # ltp_gt_5
+        )
+        return mask & trend[:, None]
+
+    snap_arr = np.asarray(snap_list)
+
+    def _collect(mask, signals, ltp, label):
+        # Candidate windows (any contract passing), then one pure-array
+        # cooldown pass over their t2 seqs. argmax on the boolean row gives
+        # the first passing column in expiry/strike order, so the same
+        # first contract per eligible t2 is picked as before.
+        cand = np.flatnonzero(mask.any(axis=1))
+        if not cand.size:
+            return
+        seqs = snap_arr[cand + 2]
+        keep = _apply_cooldown(seqs, cooldown_snapshots)
+        for w, t2 in zip(cand[keep], seqs[keep].tolist()):
+            col = int(mask[w].argmax())
+            exp, strike = cols[col]
+            signals[t2] = (exp, strike)
+            logger.info(f"✓ {label} BUY signal generated at snapshot {t2}: {exp} {strike}, "
+                        f"LTP={ltp[w + 2, col]:.2f}")
+
+    # A side with no trending window can't fire anywhere, so skip building
+    # its mask entirely — on sideways stretches that's the whole kernel
+    if underlying_increasing.any():
+        _collect(_entry_mask(c_ltp, c_oi, underlying_increasing), call_buy_signals, c_ltp, "CALL")
+    if underlying_decreasing.any():
+        _collect(_entry_mask(p_ltp, p_oi, underlying_decreasing), put_buy_signals, p_ltp, "PUT")
 
     if not call_buy_signals and not put_buy_signals:
-        logger.info(f"No signals generated. Checked {len(t0_strikes)} strikes across {len(snap_list)} snapshots")
-        # Log a summary of why no signals were found
-        if underlying_increasing:
-            logger.info("CALL signals checked but none met all conditions. Common reasons:")
-            logger.info("  - LTP not increasing across all 3 snapshots")
-            logger.info("  - LTP move < 3% (need >= 3%)")
-            logger.info("  - OI growth < 0% from t1->t2 (need >= 0%)")
-            logger.info("  - LTP <= 5 (need > 5)")
-        if underlying_decreasing:
-            logger.info("PUT signals checked but none met all conditions. Common reasons:")
-            logger.info("  - LTP not increasing across all 3 snapshots")
-            logger.info("  - LTP move < 3% (need >= 3%)")
-            logger.info("  - OI growth < 0% from t1->t2 (need >= 0%)")
-            logger.info("  - LTP <= 5 (need > 5)")
-    
+        logger.info(f"No signals generated. Checked {len(cols)} (expiry, strike) series "
+                    f"across {len(snap_list)} snapshots")
+
     return call_buy_signals, put_buy_signals
 
 
+def _snap_seqs(df: pd.DataFrame) -> pd.Index:
+    """
+    Ordered snapshot seqs of a prepared frame.
+
+    Served from the df.attrs cache prepare_data leaves behind; frames built
+    another way fall back to reading the index level directly.
+    """
+    seqs = df.attrs.get("snap_seqs")
+    if seqs is None:
+        seqs = df.index.get_level_values("SNAPSHOT_SEQ").unique()
+    return seqs
+
+
+def _extract_ltp_and_id(df: pd.DataFrame, key: Tuple, ltp_col: str):
+    """
+    (LTP, SNAPSHOT_ID) for one contract row, or (None, None) if absent.
+
+    prepare_data keys the frame by (SNAPSHOT_SEQ, EXPIRY, STRIKE), so a
+    single probe answers both fields; the old call sites duplicated a
+    membership check plus a reset_index + three-column filter fallback
+    that could never find anything the index probe missed.
+    """
+    row = _lookup_row(df, key)
+    if row is None:
+        return None, None
+    return row[ltp_col], row.get("SNAPSHOT_ID", None)
+
+
+def _snapshot_timestamp(df: pd.DataFrame, snapshot_seq: int):
+    """
+    TIMESTAMP of one snapshot, or None if the seq is absent.
+
+    Slices the sorted MultiIndex on its first level instead of
+    reset_index + boolean filter, which copied the whole frame just to
+    read a single timestamp.
+    """
+    try:
+        return pd.to_datetime(df.loc[snapshot_seq]["TIMESTAMP"].iloc[0])
+    except KeyError:
+        return None
+
+
+def _lookup_row(df: pd.DataFrame, key: Tuple) -> Optional[pd.Series]:
+    """
+    Single-probe MultiIndex lookup: the row for key, or None if absent.
+
+    Replaces the `key in df.index` + `df.loc[key]` pairs, which probed the
+    index twice (and allocated twice) per hit.
+    """
+    try:
+        return df.loc[key]
+    except KeyError:
+        return None
+
+
 def evaluate_exit_condition(
     df: pd.DataFrame,
     position_type: str,
@@ -321,11 +360,10 @@ def evaluate_exit_condition(
     """
     # Check if position exists in current snapshot
     key = (current_snapshot_seq, position_expiry, position_strike)
-    if key not in df.index:
+    curr = _lookup_row(df, key)
+    if curr is None:
         return False, "Position not found in current snapshot", None
     
-    curr = df.loc[key]
-    
     # Determine LTP and OI columns based on position type
     if position_type == "BUY_CALL":
         ltp_col = "c_LTP"
@@ -353,12 +391,10 @@ def evaluate_exit_condition(
         from datetime import datetime
         entry_dt = datetime.fromisoformat(entry_time.replace('Z', '+00:00'))
         
-        # Get current snapshot timestamp from dataframe
-        df_r = df.reset_index()
-        current_snap_data = df_r[df_r["SNAPSHOT_SEQ"] == current_snapshot_seq]
-        if not current_snap_data.empty:
-            # Get the first row's timestamp (all rows for same snapshot_seq have same timestamp)
-            current_timestamp = pd.to_datetime(current_snap_data["TIMESTAMP"].iloc[0])
+        # Get current snapshot timestamp from dataframe (all rows for the
+        # same snapshot_seq share one timestamp)
+        current_timestamp = _snapshot_timestamp(df, current_snapshot_seq)
+        if current_timestamp is not None:
             entry_timestamp = pd.to_datetime(entry_dt)
             
             # Calculate time difference in minutes
@@ -374,16 +410,15 @@ def evaluate_exit_condition(
         return False, f"Cannot determine hold time: {str(e)}", curr_ltp
     
     # Get previous snapshot data for sell signal check
-    df_r = df.reset_index()
-    snap_list = sorted(df_r["SNAPSHOT_SEQ"].unique())
-    current_idx = snap_list.index(current_snapshot_seq)
+    snap_list = _snap_seqs(df)
+    current_idx = snap_list.get_loc(current_snapshot_seq)
     
     if current_idx > 0:
         prev_snapshot_seq = snap_list[current_idx - 1]
         prev_key = (prev_snapshot_seq, position_expiry, position_strike)
-        
-        if prev_key in df.index:
-            prev = df.loc[prev_key]
+
+        prev = _lookup_row(df, prev_key)
+        if prev is not None:
             prev_ltp = prev[ltp_col]
             prev_oi = prev[oi_col]
             
@@ -431,11 +466,11 @@ def evaluate_signal(
         position_strike: Strike of open position
     """
     # Ensure we have at least 3 snapshot sequences
-    snap_seqs = sorted(df.reset_index()["SNAPSHOT_SEQ"].unique())
+    snap_seqs = _snap_seqs(df)
     if len(snap_seqs) < 3:
         return {"signal": "NO_SIGNAL", "reason": "Less than 3 snapshot sequences"}
 
-    latest_seq = snap_seqs[-1]
+    latest_seq = int(snap_seqs[-1])
     
     # If there's an open position, ONLY check for exit conditions (sell signals)
     # Do NOT check for buy signals when position is open
@@ -457,15 +492,8 @@ def evaluate_signal(
                 # Get snapshot ID
                 try:
                     key = (latest_seq, position_expiry, position_strike)
-                    if key in df.index:
-                        row = df.loc[key]
-                        snapshot_id = row.get("SNAPSHOT_ID", None)
-                    else:
-                        df_r = df.reset_index()
-                        row = df_r[(df_r["SNAPSHOT_SEQ"] == latest_seq) & 
-                                   (df_r["EXPIRY"] == position_expiry) & 
-                                   (df_r["STRIKE"] == position_strike)]
-                        snapshot_id = row.iloc[0].get("SNAPSHOT_ID", None) if not row.empty else None
+                    row = _lookup_row(df, key)
+                    snapshot_id = row.get("SNAPSHOT_ID", None) if row is not None else None
                 except Exception:
                     snapshot_id = None
                 
@@ -494,10 +522,8 @@ def evaluate_signal(
             last_buy_dt = datetime.fromisoformat(last_buy_time.replace('Z', '+00:00'))
             
             # Get current snapshot timestamp from dataframe
-            df_r = df.reset_index()
-            current_snap_data = df_r[df_r["SNAPSHOT_SEQ"] == latest_seq]
-            if not current_snap_data.empty:
-                current_timestamp = pd.to_datetime(current_snap_data["TIMESTAMP"].iloc[0])
+            current_timestamp = _snapshot_timestamp(df, latest_seq)
+            if current_timestamp is not None:
                 last_buy_timestamp = pd.to_datetime(last_buy_dt)
                 
                 # Calculate time difference in minutes
@@ -512,31 +538,23 @@ def evaluate_signal(
             # If time calculation fails, allow signal generation
             pass
 
+    # Only the newest triple can yield an actionable BUY here, so slice to
+    # the last 3 snapshots before generating: work stays O(1) as history
+    # grows. Cross-cycle spacing is enforced by the time-based cooldown
+    # above, not by the in-frame snapshot cooldown.
+    if len(snap_seqs) > 3:
+        df = df.loc[snap_seqs[-3:]]
     call_sigs, put_sigs = generate_signals(df, debug=True)
 
     if latest_seq in call_sigs:
         exp, strike = call_sigs[latest_seq]
         # Get LTP from latest snapshot
         try:
-            key = (latest_seq, exp, strike)
-            if key in df.index:
-                row = df.loc[key]
-                ltp = row["c_LTP"]
-                snapshot_id = row.get("SNAPSHOT_ID", None)
-            else:
-                # Fallback: get from reset index
-                df_r = df.reset_index()
-                row = df_r[(df_r["SNAPSHOT_SEQ"] == latest_seq) & (df_r["EXPIRY"] == exp) & (df_r["STRIKE"] == strike)]
-                if not row.empty:
-                    ltp = row.iloc[0]["c_LTP"]
-                    snapshot_id = row.iloc[0].get("SNAPSHOT_ID", None)
-                else:
-                    ltp = None
-                    snapshot_id = None
+            ltp, snapshot_id = _extract_ltp_and_id(df, (latest_seq, exp, strike), "c_LTP")
         except Exception as e:
             ltp = None
             snapshot_id = None
-        
+
         return {
             "signal": "BUY_CALL",
             "snapshot_seq": latest_seq,
@@ -549,25 +567,11 @@ def evaluate_signal(
         exp, strike = put_sigs[latest_seq]
         # Get LTP from latest snapshot
         try:
-            key = (latest_seq, exp, strike)
-            if key in df.index:
-                row = df.loc[key]
-                ltp = row["p_LTP"]
-                snapshot_id = row.get("SNAPSHOT_ID", None)
-            else:
-                # Fallback: get from reset index
-                df_r = df.reset_index()
-                row = df_r[(df_r["SNAPSHOT_SEQ"] == latest_seq) & (df_r["EXPIRY"] == exp) & (df_r["STRIKE"] == strike)]
-                if not row.empty:
-                    ltp = row.iloc[0]["p_LTP"]
-                    snapshot_id = row.iloc[0].get("SNAPSHOT_ID", None)
-                else:
-                    ltp = None
-                    snapshot_id = None
+            ltp, snapshot_id = _extract_ltp_and_id(df, (latest_seq, exp, strike), "p_LTP")
         except Exception as e:
             ltp = None
             snapshot_id = None
-        
+
         return {
             "signal": "BUY_PUT",
             "snapshot_seq": latest_seq,
@@ -582,18 +586,96 @@ def evaluate_signal(
 # ---------------------------
 # Helpers
 # ---------------------------
+# (dir, dir_mtime) -> newest path. The directory's mtime changes whenever a
+# file is added, so one stat on the directory replaces a stat per file on
+# the polls (most of them) where nothing new was written.
+_latest_file_cache: Optional[Tuple[str, float, Path]] = None
+
+
 def latest_output_file(output_dir: Path) -> Path:
-    files = sorted(output_dir.glob("snapshot_*.csv"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not files:
+    global _latest_file_cache
+    dir_mtime = output_dir.stat().st_mtime
+    cached = _latest_file_cache
+    if cached is not None and cached[0] == str(output_dir) and cached[1] == dir_mtime:
+        return cached[2]
+    # One scandir pass tracking the max mtime: DirEntry.stat comes from the
+    # directory read, and nothing needs the full sorted listing
+    newest = None
+    newest_mtime = -1.0
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith("snapshot_") and entry.name.endswith(".csv"):
+                mtime = entry.stat().st_mtime
+                if mtime > newest_mtime:
+                    newest_mtime = mtime
+                    newest = entry.path
+    if newest is None:
         raise FileNotFoundError(f"No snapshot files found in {output_dir}")
-    return files[0]
+    newest = Path(newest)
+    _latest_file_cache = (str(output_dir), dir_mtime, newest)
+    return newest
+
+
+# Known schema for the snapshot CSVs; spelling the dtypes out skips whole-file
+# type inference in read_csv. OI/volume columns stay float so NULLs from the
+# DB (empty cells) parse instead of failing an integer cast; extra keys are
+# ignored for files that lack the optional columns.
+_CSV_DTYPES = {
+    "SNAPSHOT_ID": "int64",
+    "STRIKE": "float64",
+    "UNDERLYING_VALUE": "float64",
+    "c_LTP": "float64",
+    "p_LTP": "float64",
+    "c_OI": "float64",
+    "p_OI": "float64",
+    "c_CHNG_IN_OI": "float64",
+    "p_CHNG_IN_OI": "float64",
+    "c_VOLUME": "float64",
+    "p_VOLUME": "float64",
+}
+
+
+# Columns the signal pipeline actually consumes; anything else in the file
+# (rank columns, stray index columns in hand-built files) is never parsed.
+# A callable tolerates files that carry only a subset.
+_CSV_USECOLS = frozenset((
+    "DOWNLOAD_DATE", "DOWNLOAD_TIME", "SNAPSHOT_ID", "EXPIRY", "STRIKE",
+    "UNDERLYING_VALUE", "c_OI", "c_CHNG_IN_OI", "c_LTP", "c_VOLUME",
+    "p_OI", "p_CHNG_IN_OI", "p_LTP", "p_VOLUME",
+))
 
 
 def load_csv(path: Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    df = pd.read_csv(path, engine="c", dtype=_CSV_DTYPES,
+                     usecols=lambda col: col in _CSV_USECOLS)
     return df
 
 
+# (path, mtime)-keyed cache for load_prepared; only one file is ever live
+# at a time so a single slot suffices
+_PREPARED_CACHE: Dict[str, Tuple[float, pd.DataFrame]] = {}
+
+
+def load_prepared(path: Path) -> pd.DataFrame:
+    """
+    Load and prepare a snapshot CSV, memoized on the file's mtime.
+
+    Consecutive monitor ticks mostly re-read the same unchanged file; the
+    CSV parse, datetime conversion and MultiIndex build are all skipped
+    when it hasn't changed. Callers must treat the returned frame as
+    read-only — it is shared across calls.
+    """
+    key = str(path)
+    mtime = path.stat().st_mtime
+    cached = _PREPARED_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    df_prep = prepare_data(load_csv(path))
+    _PREPARED_CACHE.clear()
+    _PREPARED_CACHE[key] = (mtime, df_prep)
+    return df_prep
+
+
 def get_current_ltp(df: pd.DataFrame, expiry: str, strike: float, signal_type: str, snapshot_seq: Optional[int] = None) -> Optional[float]:
     """
     Get current LTP for a given expiry, strike, and signal type from the latest snapshot.
@@ -611,8 +693,8 @@ def get_current_ltp(df: pd.DataFrame, expiry: str, strike: float, signal_type: s
     df_r = df.reset_index()
     
     if snapshot_seq is None:
-        snap_seqs = sorted(df_r["SNAPSHOT_SEQ"].unique())
-        if not snap_seqs:
+        snap_seqs = _snap_seqs(df)
+        if not len(snap_seqs):
             return None
         snapshot_seq = snap_seqs[-1]
     
@@ -1,12 +1,20 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from functools import lru_cache
 from pathlib import Path
+import hashlib
 import json
 import time
 from datetime import datetime
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from portfolio_manager import PortfolioManager
+
 st.set_page_config(
     page_title="Option Chain Trading Portfolio",
     page_icon="📈",
@@ -28,15 +36,29 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=30)  # Cache for 30 seconds to allow auto-refresh
+@st.cache_data(show_spinner=False)
+def _load_portfolio_cached(mtime_ns: int):
+    """Parse portfolio.json; cached per file mtime (see load_portfolio_data)."""
+    if HAS_ORJSON:
+        # C-implemented parse, several times faster on a long trade_history;
+        # returns the same plain dicts/lists as json.load
+        return orjson.loads(Path("portfolio.json").read_bytes())
+    with open("portfolio.json", 'r') as f:
+        return json.load(f)
+
+
 def load_portfolio_data():
-    """Load portfolio data from JSON file."""
+    """Load portfolio data from JSON file.
+
+    Keyed on the file's mtime rather than a TTL: reruns triggered by widget
+    interactions serve the parsed dict from memory, and a write by the
+    monitor invalidates immediately instead of up to 30s late.
+    """
     portfolio_file = Path("portfolio.json")
     if not portfolio_file.exists():
         return None
     try:
-        with open(portfolio_file, 'r') as f:
-            return json.load(f)
+        return _load_portfolio_cached(portfolio_file.stat().st_mtime_ns)
     except Exception as e:
         st.error(f"Error loading portfolio: {e}")
         return None
@@ -44,9 +66,8 @@ def load_portfolio_data():
 def get_current_position_value():
     """Get current position value if position is open."""
     try:
-        from portfolio_manager import PortfolioManager
-        from generate_signal import get_current_ltp, load_csv, prepare_data
-        
+        from generate_signal import get_current_ltp, latest_output_file, load_prepared
+
         portfolio = PortfolioManager()
         open_position = portfolio.get_open_position()
         if not open_position:
@@ -67,73 +88,81 @@ def get_current_position_value():
             except:
                 pass
         
-        # Fallback: Try to get from CSV files (for local Streamlit or if portfolio LTP is stale)
-        output_dir = Path("output")
-        csv_files = sorted(output_dir.glob("snapshot_*.csv"), key=lambda p: p.stat().st_mtime, reverse=True)
-        if csv_files:
-            try:
-                df_raw = load_csv(csv_files[0])
-                df_prep = prepare_data(df_raw)
-                current_ltp = get_current_ltp(
-                    df_prep,
-                    open_position['expiry'],
-                    open_position['strike'],
-                    open_position['type']
-                )
-                return open_position, current_ltp
-            except:
-                pass
+        # Fallback: Try to get from CSV files (for local Streamlit or if portfolio LTP is stale).
+        # latest_output_file is a single scandir pass and load_prepared is
+        # memoized on the file's mtime, so repeated reruns cost one stat.
+        try:
+            df_prep = load_prepared(latest_output_file(Path("output")))
+            current_ltp = get_current_ltp(
+                df_prep,
+                open_position['expiry'],
+                open_position['strike'],
+                open_position['type']
+            )
+            return open_position, current_ltp
+        except:
+            pass
         
         # Return position with stored LTP even if stale, or None if no LTP available
         return open_position, current_ltp
     except Exception as e:
         return None, None
 
-def calculate_portfolio_history(portfolio_data):
-    """Calculate portfolio value over time from trade history."""
+@lru_cache(maxsize=4096)
+def _parse_ts(value: str) -> pd.Timestamp:
+    """Parse one ISO timestamp, memoized across Streamlit reruns.
+
+    trade_history is append-only, so after the first render a rerun only
+    pays for the rows added since — everything else is a dict hit.
+    """
+    return pd.Timestamp(value)
+
+
+def calculate_portfolio_history(portfolio_data, portfolio, open_position, current_ltp):
+    """Calculate portfolio value over time from trade history.
+
+    Takes the PortfolioManager and the already-resolved open position /
+    LTP from main() so one rerun resolves them once instead of this
+    function re-reading portfolio.json and the snapshot CSV on its own.
+    """
     if not portfolio_data:
         return pd.DataFrame()
     
     initial_balance = portfolio_data.get('initial_balance', 100000.0)
     trade_history = portfolio_data.get('trade_history', [])
     
-    history = [{
+    start_row = {
         'timestamp': portfolio_data.get('created_at', datetime.now().isoformat()),
         'balance': initial_balance,
         'total_value': initial_balance,
         'position_value': 0.0,
         'realized_pnl': 0.0
-    }]
-    
-    current_balance = initial_balance
-    realized_pnl = 0.0
-    
-    for trade in trade_history:
-        if trade['action'] == 'BUY':
-            current_balance = trade['balance_after']
-            history.append({
-                'timestamp': trade['timestamp'],
-                'balance': current_balance,
-                'total_value': current_balance,
-                'position_value': 0.0,
-                'realized_pnl': realized_pnl
-            })
-        elif trade['action'] == 'SELL':
-            current_balance = trade['balance_after']
-            realized_pnl += trade.get('pnl', 0)
-            history.append({
-                'timestamp': trade['timestamp'],
-                'balance': current_balance,
-                'total_value': current_balance,
-                'position_value': 0.0,
-                'realized_pnl': realized_pnl
-            })
-    
-    from portfolio_manager import PortfolioManager
-    portfolio = PortfolioManager()
-    open_position, current_ltp = get_current_position_value()
+    }
+
+    # One columnar build instead of a Python loop appending a dict per
+    # trade; the running realized P&L is a cumsum over the SELL rows
+    trades = pd.DataFrame(trade_history)
+    if len(trades):
+        trades = trades[trades['action'].isin(('BUY', 'SELL'))]
+    if len(trades):
+        if 'pnl' in trades.columns:
+            sell_pnl = trades['pnl'].fillna(0.0).where(trades['action'] == 'SELL', 0.0)
+        else:
+            sell_pnl = pd.Series(0.0, index=trades.index)
+        trade_rows = pd.DataFrame({
+            'timestamp': trades['timestamp'].to_numpy(),
+            'balance': trades['balance_after'].to_numpy(),
+            'total_value': trades['balance_after'].to_numpy(),
+            'position_value': 0.0,
+            'realized_pnl': sell_pnl.cumsum().to_numpy(),
+        })
+        realized_pnl = float(sell_pnl.sum())
+    else:
+        trade_rows = None
+        realized_pnl = 0.0
+
     current_balance = portfolio.get_balance()
-    
+
     if open_position and current_ltp:
         quantity = open_position.get('quantity', 75)  # Use position quantity, default to 75
         position_value = current_ltp * quantity
@@ -146,38 +175,160 @@ def calculate_portfolio_history(portfolio_data):
         total_value = current_balance
         total_pnl = realized_pnl
     
-    history.append({
+    last_row = {
         'timestamp': datetime.now().isoformat(),
         'balance': current_balance,
         'total_value': total_value,
         'position_value': position_value,
         'realized_pnl': total_pnl
-    })
-    
-    df = pd.DataFrame(history)
-    if not df.empty:
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp')
-    
+    }
+
+    frames = [pd.DataFrame([start_row])]
+    if trade_rows is not None:
+        frames.append(trade_rows)
+    frames.append(pd.DataFrame([last_row]))
+    df = pd.concat(frames, ignore_index=True)
+    # trade_history is written in chronological order and the start/now
+    # rows bracket it, so no sort is needed after parsing
+    df['timestamp'] = pd.DatetimeIndex([_parse_ts(t) for t in df['timestamp']])
+
     return df
 
 def calculate_win_ratio(portfolio_data):
-    """Calculate win ratio from closed positions."""
+    """Calculate win/loss stats from closed positions.
+
+    Returns (win_ratio, winning_trades, losing_trades, best_pnl,
+    sum_pnl, total_trades) from a single pass, so main() doesn't rescan
+    the positions list for Best Trade and average P&L.
+    """
     if not portfolio_data:
-        return 0, 0, 0
-    
-    closed_positions = [p for p in portfolio_data.get('positions', []) if p.get('status') == 'closed']
-    
-    if not closed_positions:
-        return 0, 0, 0
-    
-    winning_trades = len([p for p in closed_positions if p.get('pnl', 0) > 0])
-    losing_trades = len([p for p in closed_positions if p.get('pnl', 0) < 0])
-    total_trades = len(closed_positions)
-    
+        return 0, 0, 0, 0, 0.0, 0
+
+    # Single pass over positions instead of three list comprehensions
+    winning_trades = losing_trades = total_trades = 0
+    best_pnl = None
+    sum_pnl = 0.0
+    for p in portfolio_data.get('positions', []):
+        if p.get('status') != 'closed':
+            continue
+        total_trades += 1
+        pnl = p.get('pnl', 0)
+        sum_pnl += pnl
+        if best_pnl is None or pnl > best_pnl:
+            best_pnl = pnl
+        if pnl > 0:
+            winning_trades += 1
+        elif pnl < 0:
+            losing_trades += 1
+
     win_ratio = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-    
-    return win_ratio, winning_trades, losing_trades
+    if best_pnl is None:
+        best_pnl = 0
+
+    return win_ratio, winning_trades, losing_trades, best_pnl, sum_pnl, total_trades
+
+@st.cache_data(show_spinner=False)
+def _build_portfolio_figure(history_key: bytes, _history: pd.DataFrame, initial_balance: float, start_label: str) -> dict:
+    """Build the portfolio-value figure as a plain dict, cached on history_key.
+
+    Plotly validates every trace attribute at construction time, which is
+    the costly part of a rerender. The underscore on _history tells
+    Streamlit not to hash the frame itself; history_key (a digest of the
+    plotted columns, built in main) is the cache key, so reruns with
+    unchanged data reuse the serialized figure instead of rebuilding it.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    # Main portfolio value line
+    fig.add_trace(go.Scatter(
+        x=_history['timestamp'],
+        y=_history['total_value'],
+        mode='lines+markers',
+        name='Total Portfolio Value',
+        line=dict(color='#1f77b4', width=3),
+        marker=dict(size=6, color='#1f77b4'),
+        hovertemplate='<b>%{fullData.name}</b><br>' +
+                     'Date: %{x|%d %b %Y %I:%M %p}<br>' +
+                     'Value: ₹%{y:,.2f}<extra></extra>',
+        fill='tozeroy',
+        fillcolor='rgba(31, 119, 180, 0.1)'
+    ))
+
+    # Cash balance line
+    fig.add_trace(go.Scatter(
+        x=_history['timestamp'],
+        y=_history['balance'],
+        mode='lines',
+        name='Cash Balance',
+        line=dict(color='#2ca02c', width=2, dash='dash'),
+        hovertemplate='<b>%{fullData.name}</b><br>' +
+                     'Date: %{x|%d %b %Y %I:%M %p}<br>' +
+                     'Value: ₹%{y:,.2f}<extra></extra>'
+    ))
+
+    # Initial balance reference line
+    fig.add_hline(
+        y=initial_balance,
+        line_dash="dot",
+        line_color="gray",
+        line_width=2,
+        annotation_text=f"Start Value: ₹{initial_balance:,.2f}",
+        annotation_position="right"
+    )
+
+    # Current value annotation
+    if len(_history) > 0:
+        last_value = _history['total_value'].iloc[-1]
+        last_time = _history['timestamp'].iloc[-1]
+        fig.add_annotation(
+            x=last_time,
+            y=last_value,
+            text=f"Current: ₹{last_value:,.2f}",
+            showarrow=True,
+            arrowhead=2,
+            arrowcolor="#2ca02c",
+            bgcolor="white",
+            bordercolor="#2ca02c",
+            borderwidth=2
+        )
+
+    fig.update_layout(
+        title={
+            'text': f'Portfolio Value Evolution (Since {start_label})',
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 18}
+        },
+        xaxis_title="Date & Time",
+        yaxis_title="Portfolio Value (₹)",
+        hovermode='x unified',
+        height=600,
+        template='plotly_white',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+
+    # Format x-axis to show dates nicely
+    fig.update_xaxes(
+        tickformat='%d %b %Y\n%I:%M %p',
+        tickangle=-45
+    )
+
+    # Format y-axis to show currency
+    fig.update_yaxes(
+        tickformat=',.0f',
+        tickprefix='₹'
+    )
+
+    return fig.to_dict()
 
 def main():
     st.markdown('<div class="main-header">📈 Option Chain Trading Portfolio Dashboard</div>', unsafe_allow_html=True)
@@ -202,7 +353,6 @@ def main():
         st.info("Run the monitor to start trading: `python automate_oi_monitor.py`")
         return
     
-    from portfolio_manager import PortfolioManager
     portfolio = PortfolioManager()
     open_position, current_ltp = get_current_position_value()
     
@@ -221,7 +371,7 @@ def main():
     total_pnl = current_total - initial_balance
     total_pnl_pct = (total_pnl / initial_balance * 100) if initial_balance > 0 else 0
     
-    win_ratio, winning_trades, losing_trades = calculate_win_ratio(portfolio_data)
+    win_ratio, winning_trades, losing_trades, best_trade, closed_pnl_sum, closed_trades = calculate_win_ratio(portfolio_data)
     
     # Key Metrics Section - Start Date, Start Value, Current Date, Current Value
     st.markdown("### 🎯 Portfolio Overview")
@@ -281,100 +431,28 @@ def main():
     
     # Portfolio Value Graph - Historical from Start Date
     st.markdown("### 📊 Portfolio Value History (Since Start)")
-    portfolio_history = calculate_portfolio_history(portfolio_data)
+    portfolio_history = calculate_portfolio_history(portfolio_data, portfolio, open_position, current_ltp)
     
     if not portfolio_history.empty:
-        fig = go.Figure()
-        
-        # Main portfolio value line
-        fig.add_trace(go.Scatter(
-            x=portfolio_history['timestamp'],
-            y=portfolio_history['total_value'],
-            mode='lines+markers',
-            name='Total Portfolio Value',
-            line=dict(color='#1f77b4', width=3),
-            marker=dict(size=6, color='#1f77b4'),
-            hovertemplate='<b>%{fullData.name}</b><br>' +
-                         'Date: %{x|%d %b %Y %I:%M %p}<br>' +
-                         'Value: ₹%{y:,.2f}<extra></extra>',
-            fill='tozeroy',
-            fillcolor='rgba(31, 119, 180, 0.1)'
-        ))
-        
-        # Cash balance line
-        fig.add_trace(go.Scatter(
-            x=portfolio_history['timestamp'],
-            y=portfolio_history['balance'],
-            mode='lines',
-            name='Cash Balance',
-            line=dict(color='#2ca02c', width=2, dash='dash'),
-            hovertemplate='<b>%{fullData.name}</b><br>' +
-                         'Date: %{x|%d %b %Y %I:%M %p}<br>' +
-                         'Value: ₹%{y:,.2f}<extra></extra>'
-        ))
-        
-        # Initial balance reference line
-        fig.add_hline(
-            y=initial_balance,
-            line_dash="dot",
-            line_color="gray",
-            line_width=2,
-            annotation_text=f"Start Value: ₹{initial_balance:,.2f}",
-            annotation_position="right"
-        )
-        
-        # Current value annotation
-        if len(portfolio_history) > 0:
-            last_value = portfolio_history['total_value'].iloc[-1]
-            last_time = portfolio_history['timestamp'].iloc[-1]
-            fig.add_annotation(
-                x=last_time,
-                y=last_value,
-                text=f"Current: ₹{last_value:,.2f}",
-                showarrow=True,
-                arrowhead=2,
-                arrowcolor="#2ca02c",
-                bgcolor="white",
-                bordercolor="#2ca02c",
-                borderwidth=2
-            )
-        
-        fig.update_layout(
-            title={
-                'text': f'Portfolio Value Evolution (Since {start_date.strftime("%d %b %Y")})',
-                'x': 0.5,
-                'xanchor': 'center',
-                'font': {'size': 18}
-            },
-            xaxis_title="Date & Time",
-            yaxis_title="Portfolio Value (₹)",
-            hovermode='x unified',
-            height=600,
-            template='plotly_white',
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            ),
-            margin=dict(l=50, r=50, t=80, b=50)
-        )
-        
-        # Format x-axis to show dates nicely
-        fig.update_xaxes(
-            tickformat='%d %b %Y\n%I:%M %p',
-            tickangle=-45
-        )
-        
-        # Format y-axis to show currency
-        fig.update_yaxes(
-            tickformat=',.0f',
-            tickprefix='₹'
+        # plotly is only needed once there is a history to chart; deferring
+        # the import keeps it off the no-data cold-start path
+        import plotly.graph_objects as go
+
+        # Key the cached figure on the plotted data. The final row's
+        # timestamp is the rerun's wall clock, so it is left out of the
+        # digest — interactions that change nothing else hit the cache.
+        ts = portfolio_history['timestamp'].to_numpy()
+        history_key = hashlib.blake2b(
+            ts[:-1].tobytes()
+            + portfolio_history[['total_value', 'balance']].to_numpy(dtype=float).tobytes(),
+            digest_size=16,
+        ).digest()
+        fig_dict = _build_portfolio_figure(
+            history_key, portfolio_history, initial_balance,
+            start_date.strftime('%d %b %Y'),
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
+        st.plotly_chart(go.Figure(fig_dict), use_container_width=True)
+
         # Show time period summary
         days_running = (current_date - start_date).days
         hours_running = (current_date - start_date).total_seconds() / 3600
@@ -475,12 +553,10 @@ def main():
         st.metric("Closed Positions", closed_count)
     
     with col3:
-        avg_pnl = (summary['total_pnl'] / closed_count) if closed_count > 0 else 0
+        avg_pnl = (closed_pnl_sum / closed_trades) if closed_trades > 0 else 0
         st.metric("Avg P&L per Trade", f"₹{avg_pnl:,.2f}")
-    
+
     with col4:
-        closed_positions = [p for p in portfolio_data.get('positions', []) if p.get('status') == 'closed']
-        best_trade = max([p.get('pnl', 0) for p in closed_positions], default=0)
         st.metric("Best Trade", f"₹{best_trade:,.2f}")
 
 if __name__ == "__main__":
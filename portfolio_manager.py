@@ -33,6 +33,7 @@ class PortfolioManager:
         self.portfolio_file = portfolio_file
         self.initial_balance = initial_balance
         self._save_lock = threading.Lock()  # Lock to prevent concurrent saves
+        self._last_saved_state = None  # Serialized form of the last state written to disk
         self.portfolio = self._load_portfolio()
     
     def _load_portfolio(self) -> Dict:
@@ -131,16 +132,35 @@ class PortfolioManager:
         else:
             return obj
     
-    def _save_portfolio(self, portfolio: Optional[Dict] = None):
-        """Save portfolio to file using atomic write and file locking to prevent corruption."""
+    def _save_portfolio(self, portfolio: Optional[Dict] = None, sync: bool = True):
+        """
+        Save portfolio to file using atomic write and file locking to prevent corruption.
+
+        Args:
+            portfolio: State to save (defaults to self.portfolio)
+            sync: When False, skip the per-write fsync; the caller batches
+                  several writes and issues one directory fsync at the end
+        """
         if portfolio is None:
             portfolio = self.portfolio
-        
+
+        # Skip the write (and the git commit/push it triggers) when nothing
+        # besides the timestamp would change; the status updater calls this
+        # every minute regardless of activity
+        state = json.dumps(
+            {k: v for k, v in self._convert_numpy_to_python(portfolio).items()
+             if k != 'last_updated'},
+            sort_keys=True
+        )
+        if state == self._last_saved_state:
+            logger.debug("Portfolio unchanged - skipping save")
+            return
+
         portfolio["last_updated"] = datetime.now().isoformat()
-        
+
         # Convert numpy types to Python types before JSON serialization
         portfolio = self._convert_numpy_to_python(portfolio)
-        
+
         # Use thread lock to prevent concurrent saves from different threads
         with self._save_lock:
             try:
@@ -150,12 +170,14 @@ class PortfolioManager:
                 with open(temp_file, 'w') as f:
                     json.dump(portfolio, f, indent=2)
                     f.flush()
-                    import os
-                    os.fsync(f.fileno())  # Force write to disk
+                    if sync:
+                        import os
+                        os.fsync(f.fileno())  # Force write to disk
                 
                 # Atomic rename (this is atomic on most filesystems)
                 # If rename fails, original file is unchanged
                 temp_file.replace(self.portfolio_file)
+                self._last_saved_state = state
                 logger.debug("Portfolio saved successfully")
                 
                 # Auto-sync to git for Streamlit Cloud (non-blocking)
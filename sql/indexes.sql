@@ -0,0 +1,11 @@
+-- Supporting indexes for the monitor's main query (see automate_oi_monitor.py).
+--
+-- The ExpiryRank CTE joins back to optionchain_combined on plain
+-- (TICKER, SNAPSHOT_ID, EXPIRY) equality; this index serves both that join
+-- and the SnapshotSet / latest-snapshot probes, which filter on TICKER and
+-- order by SNAPSHOT_ID.
+--
+-- Run once against the optionchaindb database.
+
+CREATE INDEX ix_oc_ticker_snap_expiry
+    ON optionchain_combined (TICKER, SNAPSHOT_ID, EXPIRY);
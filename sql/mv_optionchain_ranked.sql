@@ -0,0 +1,108 @@
+-- Optional pre-materialised strike ranking for the option chain monitor.
+--
+-- The main monitor query recomputes DENSE_RANK over expiries plus two
+-- ROW_NUMBER passes per snapshot on every read, only to keep the ~20 strikes
+-- nearest the underlying. This table stores that ranked result once per
+-- snapshot at write time, so reads become a plain indexed lookup:
+--
+--     SELECT ... FROM mv_optionchain_ranked
+--     WHERE TICKER = %s AND SNAPSHOT_ID = %s
+--       AND (above_rank < 10 OR below_rank < 10)
+--
+-- MySQL has no true materialized views, so this is a regular table refreshed
+-- by the refresh_optionchain_ranked procedure. Call the procedure from the
+-- snapshot loader after each snapshot's rows are fully inserted (an AFTER
+-- INSERT trigger would re-rank the snapshot once per inserted row, and would
+-- see incomplete snapshots mid-batch). The monitor detects the table
+-- automatically and falls back to the inline CTE when it is missing or stale.
+--
+-- Run this once against the optionchaindb database.
+
+CREATE TABLE IF NOT EXISTS mv_optionchain_ranked (
+    TICKER           VARCHAR(32)  NOT NULL,
+    DOWNLOAD_DATE    DATE         NOT NULL,
+    DOWNLOAD_TIME    VARCHAR(16)  NOT NULL,
+    SNAPSHOT_ID      BIGINT       NOT NULL,
+    EXPIRY           DATE         NOT NULL,
+    STRIKE           DOUBLE       NOT NULL,
+    UNDERLYING_VALUE DOUBLE,
+    c_OI             BIGINT,
+    c_CHNG_IN_OI     BIGINT,
+    c_LTP            DOUBLE,
+    c_VOLUME         BIGINT,
+    p_OI             BIGINT,
+    p_CHNG_IN_OI     BIGINT,
+    p_LTP            DOUBLE,
+    p_VOLUME         BIGINT,
+    above_rank       INT,
+    below_rank       INT,
+    PRIMARY KEY (TICKER, SNAPSHOT_ID, STRIKE),
+    KEY ix_ranked_lookup (TICKER, SNAPSHOT_ID, above_rank, below_rank)
+);
+
+DELIMITER $$
+
+CREATE PROCEDURE refresh_optionchain_ranked(IN p_ticker VARCHAR(32), IN p_snapshot_id BIGINT)
+BEGIN
+    DELETE FROM mv_optionchain_ranked
+    WHERE TICKER = p_ticker AND SNAPSHOT_ID = p_snapshot_id;
+
+    INSERT INTO mv_optionchain_ranked
+    WITH ClosestExpiry AS (
+        SELECT
+            oc.TICKER,
+            oc.DOWNLOAD_DATE,
+            oc.DOWNLOAD_TIME,
+            oc.SNAPSHOT_ID,
+            oc.EXPIRY,
+            oc.STRIKE,
+            oc.UNDERLYING_VALUE,
+            oc.c_OI,
+            oc.c_CHNG_IN_OI,
+            oc.c_LTP,
+            oc.c_VOLUME,
+            oc.p_OI,
+            oc.p_CHNG_IN_OI,
+            oc.p_LTP,
+            oc.p_VOLUME,
+            DENSE_RANK() OVER (
+                ORDER BY ABS(DATEDIFF(oc.EXPIRY, oc.DOWNLOAD_DATE))
+            ) AS expiry_rank
+        FROM optionchain_combined oc
+        WHERE oc.TICKER = p_ticker AND oc.SNAPSHOT_ID = p_snapshot_id
+    ),
+    FilteredExpiry AS (
+        SELECT * FROM ClosestExpiry WHERE expiry_rank = 1
+    ),
+    Ranked AS (
+        -- Single window pass, same as the monitor's inline query: partition
+        -- by side of the underlying, order by distance from it.
+        SELECT *,
+            ROW_NUMBER() OVER (
+                PARTITION BY CASE WHEN STRIKE >= UNDERLYING_VALUE THEN 1 ELSE 0 END
+                ORDER BY ABS(STRIKE - UNDERLYING_VALUE)
+            ) AS side_rank
+        FROM FilteredExpiry
+    )
+    SELECT
+        TICKER,
+        DOWNLOAD_DATE,
+        DOWNLOAD_TIME,
+        SNAPSHOT_ID,
+        EXPIRY,
+        STRIKE,
+        UNDERLYING_VALUE,
+        c_OI,
+        c_CHNG_IN_OI,
+        c_LTP,
+        c_VOLUME,
+        p_OI,
+        p_CHNG_IN_OI,
+        p_LTP,
+        p_VOLUME,
+        CASE WHEN STRIKE >= UNDERLYING_VALUE THEN side_rank END AS above_rank,
+        CASE WHEN STRIKE < UNDERLYING_VALUE THEN side_rank END AS below_rank
+    FROM Ranked;
+END$$
+
+DELIMITER ;
@@ -0,0 +1,39 @@
+-- Optional change-notification support for the option chain monitor.
+--
+-- The monitor normally polls optionchain_combined for a new SNAPSHOT_ID every
+-- check_interval seconds. If this events table and trigger are installed on
+-- the MySQL server, the monitor detects them automatically and waits on the
+-- lightweight snapshot_events table instead (a covering-index probe plus a
+-- server-side SLEEP between probes), so idle ticks stop scanning the large
+-- snapshot table.
+--
+-- Run this once against the optionchaindb database with a user that has
+-- CREATE TABLE and TRIGGER privileges.
+
+CREATE TABLE IF NOT EXISTS snapshot_events (
+    id          BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    ticker      VARCHAR(32)     NOT NULL,
+    snapshot_id BIGINT          NOT NULL,
+    ts          DATETIME        NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id),
+    KEY ix_events_ticker_id (ticker, id)
+);
+
+DELIMITER $$
+
+CREATE TRIGGER trg_optionchain_snapshot_event
+AFTER INSERT ON optionchain_combined
+FOR EACH ROW
+BEGIN
+    -- One event per snapshot, not per row: the snapshot loader inserts many
+    -- rows per SNAPSHOT_ID, so only record the first one seen.
+    IF NOT EXISTS (
+        SELECT 1 FROM snapshot_events
+        WHERE ticker = NEW.TICKER AND snapshot_id = NEW.SNAPSHOT_ID
+    ) THEN
+        INSERT INTO snapshot_events (ticker, snapshot_id)
+        VALUES (NEW.TICKER, NEW.SNAPSHOT_ID);
+    END IF;
+END$$
+
+DELIMITER ;
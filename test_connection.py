@@ -62,17 +62,16 @@ def test_connection():
         logger.info("   (This may take a few seconds...)")
         results = monitor.execute_query_for_snapshots(snapshot_ids)
         
-        if results:
+        if len(results):
             logger.info(f"✓ Query executed successfully!")
             logger.info(f"✓ Retrieved {len(results)} rows")
-            
+
             # Show sample data
-            if len(results) > 0:
-                logger.info("\n5. Sample data (first row):")
-                sample = results[0]
-                for key, value in list(sample.items())[:5]:  # Show first 5 columns
-                    logger.info(f"   {key}: {value}")
-                logger.info(f"   ... ({len(sample)} total columns)")
+            logger.info("\n5. Sample data (first row):")
+            sample = results.iloc[0]
+            for key, value in list(sample.items())[:5]:  # Show first 5 columns
+                logger.info(f"   {key}: {value}")
+            logger.info(f"   ... ({len(results.columns)} total columns)")
         else:
             logger.warning("⚠ Query executed but returned no results")
             return False